@@ -1,13 +1,15 @@
-import pandas as pd
 import plotly.express as px
 import matplotlib.pyplot as plt
 import sys # Import sys for exit
 import numpy as np # Import numpy for NaN handling
+from multiverse_results_writer import read_results
+from multiverse_ingestion import compact_multiverse_frame
 
-# Load the quantum results from the CSV file generated by multiverse_quantum_analysis.py
-csv_file = 'multiverse_quantum_results.csv'
+# Load the quantum results generated by multiverse_quantum_analysis.py
+# (a CSV file, or a Parquet directory when run with --format parquet)
+csv_file = sys.argv[1] if len(sys.argv) > 1 else 'multiverse_quantum_results.csv'
 try:
-    quantum_df = pd.read_csv(csv_file)
+    quantum_df = read_results(csv_file)
 except FileNotFoundError:
     print(f"Error: {csv_file} not found.")
     print("Please ensure 'multiverse_quantum_analysis.py' ran successfully and generated the file.")
@@ -35,6 +37,9 @@ if missing_columns:
 # ------------------------------------
 
 # --- Data Transformation ---
+# Compact ID columns (smallest unsigned ints); this also turns categorical IDs
+# from Parquet results back into plain numbers for the 3D axes
+quantum_df = compact_multiverse_frame(quantum_df)
 # Ensure Quantum_State is string before mapping, handle potential non-string values
 quantum_df['Quantum_State'] = quantum_df['Quantum_State'].astype(str)
 # Map quantum states to numerical values for plotting. Handle unexpected values.
@@ -12,9 +12,34 @@ class OmniversePortal:
         # Add actual transition logic here
 
 class QuantumOmniverseDecision(QuantumDecision):
-    def __init__(self, *args):
-        super().__init__(*args)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.omniverse_portal = OmniversePortal()
+    @classmethod
+    def from_top_realities(cls, cross_reality_analysis, k=3, tie_break="first", **kwargs):
+        """
+        Builds a decision over the k most stable realities.
+
+        Args:
+            cross_reality_analysis: Scored DataFrame, or an iterable of scored
+                chunks, with a 'Predicted Stability' column indexed by reality.
+            k (int): Number of realities to choose between.
+            tie_break (str): See reality_selection.TIE_BREAKS.
+            **kwargs: Passed to QuantumDecision (backend, seed).
+
+        Returns:
+            QuantumOmniverseDecision: Decision whose outcomes are the selected
+            realities, with probabilities from their shifted stability scores.
+        """
+        # Imported here so the portal itself does not pull in pandas
+        from reality_selection import select_top_realities
+        top_realities = select_top_realities(cross_reality_analysis, k=k, tie_break=tie_break)
+        probabilities_raw = top_realities['Predicted Stability'].to_numpy()
+
+        # Normalize probabilities (simple example: shift to non-negative and normalize)
+        probabilities_shifted = probabilities_raw - probabilities_raw.min() + 1e-9 # Add small epsilon if min is 0
+        probabilities = probabilities_shifted / probabilities_shifted.sum()
+        return cls(top_realities.index.tolist(), probabilities.tolist(), **kwargs)
     def make_decision(self):
         decision = super().make_decision(sample=True) # Assuming you want a single sampled decision
         self.omniverse_portal.transition_to_reality(decision)
@@ -0,0 +1,41 @@
+"""
+Atomic file replacement for caches, checkpoints and reports.
+
+atomic_write() writes to a uniquely named temporary file next to the
+destination and renames it over the destination when done, so readers and
+reruns after a crash see either the previous file or the complete new one.
+Concurrent writers of the same path each get their own temporary file.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+# mkstemp creates owner-only files; apply the process umask like open() would
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_write(path, mode="wb"):
+    """
+    Opens a temporary file that replaces `path` when the block exits cleanly.
+    If the block raises, the temporary file is removed and `path` is untouched.
+
+    Args:
+        path (str): Destination file; its directory must exist.
+        mode (str): "wb" for binary or "w" for text output.
+
+    Yields:
+        file: The open temporary file.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,375 @@
+"""
+Benchmarks and statistical checks for the QuantumDreamsAI pipeline.
+
+Run a single benchmark by name, e.g.:
+
+    python benchmarks.py decision-backends
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+import numpy as np
+from scipy.stats import chisquare
+
+
+# --- QuantumDecision backends ---
+def bench_decision_backends(shots=8192, trials=20, seed=1234):
+    """
+    Times each QuantumDecision backend and checks that its outcome counts agree
+    with the stored probabilities (chi-square goodness of fit).
+
+    Args:
+        shots (int): Shots per decision distribution.
+        trials (int): Number of distributions drawn per backend.
+        seed (int): Seed for the analytic backend and outcome sampling.
+
+    Returns:
+        list: One result dict per backend.
+    """
+    from quantum_decision import BACKENDS, QuantumDecision
+
+    outcomes = ["Action A", "Action B", "Action C", "Action D", "Action E"]
+    probabilities = np.array([0.1, 0.35, 0.25, 0.2, 0.1])
+
+    results = []
+    for backend in BACKENDS:
+        decision_maker = QuantumDecision(outcomes, probabilities.tolist(), backend=backend, seed=seed)
+        decision_maker.make_decision(sample=False, shots=shots) # Warm up caches
+
+        total_counts = np.zeros(len(outcomes))
+        start = time.perf_counter()
+        for _ in range(trials):
+            distribution = decision_maker.make_decision(sample=False, shots=shots)
+            total_counts += np.array([distribution[o] for o in outcomes]) * shots
+        elapsed = time.perf_counter() - start
+
+        # Exact backends have no shot noise, so only the sampled ones are tested.
+        p_value = None
+        if backend != "statevector":
+            p_value = chisquare(total_counts, probabilities * total_counts.sum()).pvalue
+        max_abs_error = np.abs(total_counts / total_counts.sum() - probabilities).max()
+
+        results.append({
+            "backend": backend,
+            "seconds_per_call": elapsed / trials,
+            "max_abs_error": float(max_abs_error),
+            "chi2_p_value": p_value,
+        })
+    return results
+
+
+def _print_decision_backends(args):
+    results = bench_decision_backends(shots=args.shots, trials=args.trials)
+    print(f"{'backend':<12} {'us/call':>12} {'max|err|':>10} {'chi2 p':>8}")
+    for row in results:
+        p_value = "-" if row["chi2_p_value"] is None else f"{row['chi2_p_value']:.3f}"
+        print(f"{row['backend']:<12} {row['seconds_per_call'] * 1e6:>12.1f} "
+              f"{row['max_abs_error']:>10.5f} {p_value:>8}")
+    failed = [r["backend"] for r in results if r["chi2_p_value"] is not None and r["chi2_p_value"] < 1e-3]
+    if failed:
+        raise SystemExit(f"Backends disagree with the stored probabilities: {failed}")
+# ---------------------------------
+
+
+# --- Outcome sampling ---
+def bench_alias_sampling(sizes=(4, 16, 256, 4096, 65536), draws=2000, seed=1234):
+    """
+    Compares ways of drawing a single decision from an outcome distribution:
+    np.random.choice over the outcome list (the original make_decision path),
+    an inverse-CDF lookup on a fresh distribution (the "aer" path, whose
+    distribution changes every call), and an AliasTable draw, both with the
+    table cached (statevector/analytic) and rebuilt on every call.
+
+    Args:
+        sizes (tuple): Outcome-set sizes to benchmark.
+        draws (int): Single draws timed per size and method.
+        seed (int): Seed for the random generators.
+
+    Returns:
+        list: One result dict per outcome-set size.
+    """
+    from quantum_decision import AliasTable
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in sizes:
+        distribution = dict(zip((f"Outcome {i}" for i in range(size)), rng.dirichlet(np.ones(size))))
+        weights = np.fromiter(distribution.values(), dtype=float, count=size)
+        labels = np.empty(size, dtype=object)
+        labels[:] = list(distribution)
+
+        start = time.perf_counter()
+        for _ in range(draws):
+            outcome_list = list(distribution.keys())
+            prob_list = np.array(list(distribution.values()))
+            prob_list /= prob_list.sum()
+            np.random.choice(outcome_list, p=prob_list)
+        choice_seconds = (time.perf_counter() - start) / draws
+
+        start = time.perf_counter()
+        for _ in range(draws):
+            cumulative = np.cumsum(weights)
+            labels[min(np.searchsorted(cumulative, rng.random() * cumulative[-1], side="right"), size - 1)]
+        inverse_cdf_seconds = (time.perf_counter() - start) / draws
+
+        start = time.perf_counter()
+        table = AliasTable(weights)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(draws):
+            labels[table.sample(rng)]
+        alias_seconds = (time.perf_counter() - start) / draws
+
+        results.append({
+            "outcomes": size,
+            "choice_us": choice_seconds * 1e6,
+            "inverse_cdf_us": inverse_cdf_seconds * 1e6,
+            "alias_us": alias_seconds * 1e6,
+            "alias_build_ms": build_seconds * 1e3,
+            # What a draw costs when the table cannot be reused between calls
+            "alias_with_build_us": alias_seconds * 1e6 + build_seconds * 1e6,
+        })
+    return results
+
+
+def _print_alias_sampling(args):
+    print(f"{'outcomes':>9} {'choice us':>11} {'inv-cdf us':>11} {'alias us':>10} "
+          f"{'build ms':>10} {'alias+build us':>15}")
+    for row in bench_alias_sampling(draws=args.trials * 100):
+        print(f"{row['outcomes']:>9} {row['choice_us']:>11.1f} {row['inverse_cdf_us']:>11.1f} "
+              f"{row['alias_us']:>10.1f} {row['alias_build_ms']:>10.2f} {row['alias_with_build_us']:>15.1f}")
+# ------------------------
+
+
+# --- Import time ---
+def bench_import_time(modules=("quantum_decision", "OmniversePortal", "omniverse_activation_main"), repeats=5):
+    """
+    Measures the cold-start import time of each module in a fresh interpreter
+    and records whether the import pulled in qiskit.
+
+    Args:
+        modules (tuple): Module names to import.
+        repeats (int): Fresh interpreters started per module; the best time is kept.
+
+    Returns:
+        list: One result dict per module.
+    """
+    probe = ("import sys, time; start = time.perf_counter(); import {module}; "
+             "print(time.perf_counter() - start, 'qiskit' in sys.modules)")
+    results = []
+    for module in modules:
+        timings = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, "-c", probe.format(module=module)],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            timings.append(float(output[-2]))
+        results.append({
+            "module": module,
+            "best_seconds": min(timings),
+            "imports_qiskit": output[-1] == "True",
+        })
+    return results
+
+
+def _print_import_time(args):
+    print(f"{'module':<28} {'best ms':>9} {'qiskit loaded':>14}")
+    for row in bench_import_time(repeats=max(1, args.trials // 4)):
+        print(f"{row['module']:<28} {row['best_seconds'] * 1e3:>9.1f} {str(row['imports_qiskit']):>14}")
+# -------------------
+
+
+# --- Parallel ingestion ---
+def bench_ingest_parallel(shape=(16, 4, 250_000), worker_counts=(1, 2, 4, 8), seed=1234, repeats=3):
+    """
+    Times seeded multiverse data generation at several worker counts and
+    checks that every worker count produces bit-identical data.
+
+    Args:
+        shape (tuple): (universes, realities, datapoints) to generate.
+        worker_counts (tuple): Thread counts to time.
+        seed (int): Root seed of the per-universe streams.
+        repeats (int): Runs per worker count; the best time is kept.
+
+    Returns:
+        list: One result dict per worker count.
+    """
+    from multiverse_ingestion import fill_multiverse_data
+
+    reference = fill_multiverse_data(np.empty(shape), seed)
+    out = np.empty(shape)
+    results = []
+    for workers in worker_counts:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fill_multiverse_data(out, seed, workers=workers)
+            timings.append(time.perf_counter() - start)
+        results.append({
+            "workers": workers,
+            "best_seconds": min(timings),
+            "identical": bool(np.array_equal(out, reference)),
+        })
+    return results
+
+
+def _print_ingest_parallel(args):
+    results = bench_ingest_parallel(repeats=max(1, args.trials // 4))
+    print(f"{'workers':>8} {'best ms':>9} {'speedup':>8} {'identical':>10}")
+    for row in results:
+        print(f"{row['workers']:>8} {row['best_seconds'] * 1e3:>9.1f} "
+              f"{results[0]['best_seconds'] / row['best_seconds']:>7.2f}x {str(row['identical']):>10}")
+    if not all(row["identical"] for row in results):
+        raise SystemExit("Seeded generation differs between worker counts.")
+# --------------------------
+
+
+# --- 1-D clustering ---
+def _within_cluster_ss(values, labels, n_clusters):
+    counts = np.bincount(labels, minlength=n_clusters)
+    sums = np.bincount(labels, weights=values, minlength=n_clusters)
+    nonempty = counts > 0
+    return float(values @ values - (sums[nonempty] ** 2 / counts[nonempty]).sum())
+
+
+def bench_clustering_1d(sizes=(10**5, 10**6, 10**7, 10**8), n_clusters=5, max_points=10**7,
+                        exact_max_points=10**6, kmeans_max_points=10**7, seed=1234):
+    """
+    Compares the align_realities clustering engines on uniform 1-D data:
+    time and within-cluster sum of squares (lower is better; "ckmeans" is
+    the optimum).
+
+    Args:
+        sizes (tuple): Numbers of points to cluster.
+        n_clusters (int): Number of clusters.
+        max_points (int): Sizes above this are skipped entirely.
+        exact_max_points (int): Largest size run with the exact engine.
+        kmeans_max_points (int): Largest size run with scikit-learn KMeans.
+        seed (int): Seed for the data and KMeans.
+
+    Returns:
+        list: One result dict per size and engine.
+    """
+    from sklearn.cluster import KMeans
+    from clustering_1d import ckmeans_1d, histogram_kmeans_1d
+
+    engines = {
+        "kmeans": (kmeans_max_points,
+                   lambda x: KMeans(n_clusters=n_clusters, n_init="auto", random_state=seed).fit_predict(x[:, None])),
+        "ckmeans": (exact_max_points, lambda x: ckmeans_1d(x, n_clusters)[0]),
+        "histogram": (max_points, lambda x: histogram_kmeans_1d(x, n_clusters)[0]),
+    }
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in sizes:
+        if size > max_points:
+            continue
+        values = rng.random(size)
+        for engine, (limit, cluster) in engines.items():
+            if size > limit:
+                continue
+            start = time.perf_counter()
+            labels = cluster(values)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "points": size,
+                "engine": engine,
+                "seconds": elapsed,
+                "within_ss": _within_cluster_ss(values, labels, n_clusters),
+            })
+    return results
+
+
+def _print_clustering_1d(args):
+    print(f"{'points':>11} {'engine':<10} {'seconds':>9} {'within SS':>14}")
+    for row in bench_clustering_1d(max_points=args.max_points):
+        print(f"{row['points']:>11} {row['engine']:<10} {row['seconds']:>9.3f} {row['within_ss']:>14.6f}")
+# ----------------------
+
+
+# --- Stability models ---
+def bench_stability_models(sizes=(1_000, 10_000, 100_000), n_features=5, max_points=10**7, seed=1234):
+    """
+    Compares the cross_reality_analytics stability estimators on a synthetic
+    nonlinear target: training time, prediction latency, pickled model size
+    and held-out R^2.
+
+    Args:
+        sizes (tuple): Numbers of universes (rows).
+        n_features (int): Reality clusters (feature columns).
+        max_points (int): Sizes above this are skipped.
+        seed (int): Seed for the data.
+
+    Returns:
+        list: One result dict per size and model.
+    """
+    import io
+    import joblib
+    from sklearn.model_selection import train_test_split
+    from cross_reality_analytics import STABILITY_MODELS, TEST_SIZE, make_stability_model
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in sizes:
+        if size > max_points:
+            continue
+        features = rng.random((size, n_features), dtype=np.float32)
+        target = np.sin(3 * features[:, 0]) + features[:, 1] * features[:, 2] + 0.1 * rng.standard_normal(size)
+        X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=TEST_SIZE, random_state=42)
+        for name in STABILITY_MODELS:
+            model = make_stability_model(name)
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            train_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            model.predict(X_test[:1])
+            single_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            predictions = model.predict(X_test)
+            batch_seconds = time.perf_counter() - start
+
+            buffer = io.BytesIO()
+            joblib.dump(model, buffer)
+            residual = ((y_test - predictions) ** 2).sum()
+            results.append({
+                "universes": size,
+                "model": name,
+                "train_seconds": train_seconds,
+                "predict_one_ms": single_seconds * 1e3,
+                "predict_batch_ms": batch_seconds * 1e3,
+                "model_bytes": buffer.getbuffer().nbytes,
+                "r2": float(1 - residual / ((y_test - y_test.mean()) ** 2).sum()),
+            })
+    return results
+
+
+def _print_stability_models(args):
+    print(f"{'universes':>10} {'model':<18} {'train s':>8} {'1 row ms':>9} {'batch ms':>9} {'model KiB':>10} {'R^2':>7}")
+    for row in bench_stability_models(max_points=args.max_points):
+        print(f"{row['universes']:>10} {row['model']:<18} {row['train_seconds']:>8.3f} {row['predict_one_ms']:>9.2f} "
+              f"{row['predict_batch_ms']:>9.1f} {row['model_bytes'] / 1024:>10.0f} {row['r2']:>7.3f}")
+# ------------------------
+
+
+BENCHMARKS = {
+    "alias-sampling": _print_alias_sampling,
+    "clustering-1d": _print_clustering_1d,
+    "decision-backends": _print_decision_backends,
+    "import-time": _print_import_time,
+    "ingest-parallel": _print_ingest_parallel,
+    "stability-models": _print_stability_models,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--shots", type=int, default=8192)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--max-points", type=int, default=10**7,
+                        help="Largest dataset for size sweeps (clustering-1d goes up to 10**8).")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
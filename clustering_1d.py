@@ -0,0 +1,206 @@
+"""
+Exact and histogram-based k-means for one-dimensional data.
+
+In one dimension an optimal k-means clustering splits the sorted values into
+k contiguous runs, so it can be found exactly by dynamic programming
+(Ckmeans.1d.dp, Wang & Song 2011) instead of iterating Lloyd's algorithm from
+random starts. Each DP layer is solved with the divide-and-conquer
+optimization (the best split point is monotone), vectorized so that every
+recursion level is a handful of NumPy operations over all points at once.
+
+Labels are deterministic: cluster 0 holds the smallest values and cluster
+k-1 the largest.
+"""
+import warnings
+
+import numpy as np
+
+
+def _segment_costs(prefix, starts, ends):
+    """
+    Within-cluster sum of squares of the sorted points starts..ends (inclusive).
+
+    `prefix` holds the running weight, weighted sum and weighted sum of
+    squares; `ends` may be a scalar or an array matching `starts`.
+    """
+    prefix_w, prefix_x, prefix_xx = prefix
+    w = prefix_w[ends + 1] - prefix_w[starts]
+    s = prefix_x[ends + 1] - prefix_x[starts]
+    ss = prefix_xx[ends + 1] - prefix_xx[starts]
+    return np.maximum(ss - s * s / w, 0.0)
+
+
+def _optimal_cluster_starts(x, w, n_clusters):
+    """
+    Finds the optimal partition of weighted, strictly increasing points.
+
+    Args:
+        x (np.ndarray): Sorted, distinct point values.
+        w (np.ndarray): Positive weight (multiplicity) of each point.
+        n_clusters (int): Number of clusters, at most len(x).
+
+    Returns:
+        np.ndarray: Index of the first point of each cluster, ascending.
+    """
+    m = len(x)
+    # Centering keeps the prefix sums of squares small, limiting cancellation
+    centered = x - np.average(x, weights=w)
+    prefix = (
+        np.concatenate(([0.0], np.cumsum(w, dtype=np.float64))),
+        np.concatenate(([0.0], np.cumsum(w * centered))),
+        np.concatenate(([0.0], np.cumsum(w * centered * centered))),
+    )
+
+    cost = _segment_costs(prefix, 0, np.arange(m))
+    split_points = []
+
+    for layer in range(1, n_clusters):
+        # cost[i]: best cost of `layer` clusters over points 0..i; find the best
+        # start j of the next cluster for every end i >= layer.
+        previous = cost
+        cost = np.full(m, np.inf)
+        best_start = np.zeros(m, dtype=np.int64)
+
+        # Pending subproblems: ends lo..hi whose best start lies in opt_lo..opt_hi
+        lo = np.array([layer])
+        hi = np.array([m - 1])
+        opt_lo = np.array([layer])
+        opt_hi = np.array([m - 1])
+        while len(lo):
+            mid = (lo + hi) // 2
+            last = np.minimum(mid, opt_hi)
+            lengths = last - opt_lo + 1
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+            # Every candidate start of every subproblem, flattened
+            task = np.repeat(np.arange(len(mid)), lengths)
+            starts = opt_lo[task] + np.arange(len(task)) - offsets[task]
+            values = previous[starts - 1] + _segment_costs(prefix, starts, mid[task])
+
+            # Leftmost minimum per subproblem keeps the split points monotone
+            minima = np.minimum.reduceat(values, offsets)
+            positions = np.where(values == minima[task], np.arange(len(values)), len(values))
+            chosen = starts[np.minimum.reduceat(positions, offsets)]
+            cost[mid] = minima
+            best_start[mid] = chosen
+
+            left = lo <= mid - 1
+            right = mid + 1 <= hi
+            lo, hi, opt_lo, opt_hi = (
+                np.concatenate((lo[left], mid[right] + 1)),
+                np.concatenate((mid[left] - 1, hi[right])),
+                np.concatenate((opt_lo[left], chosen[right])),
+                np.concatenate((chosen[left], opt_hi[right])),
+            )
+        split_points.append(best_start)
+
+    # Walk back from the last point through the stored best starts
+    starts = [0] * n_clusters
+    end = m - 1
+    for layer in range(n_clusters - 1, 0, -1):
+        starts[layer] = int(split_points[layer - 1][end])
+        end = starts[layer] - 1
+    return np.array(starts, dtype=np.int64)
+
+
+def _check_n_clusters(n_clusters, n_distinct):
+    if n_clusters < 1:
+        raise ValueError(f"n_clusters must be at least 1, got {n_clusters}.")
+    if n_distinct < n_clusters:
+        warnings.warn(f"Number of distinct values ({n_distinct}) is less than n_clusters ({n_clusters}). "
+                      f"Setting n_clusters to number of distinct values.")
+        return n_distinct
+    return n_clusters
+
+
+def _labels_and_centers(point_labels, inverse, sums, counts, n_clusters):
+    """Expands per-point cluster labels to every value and computes exact cluster means."""
+    labels = point_labels[inverse]
+    centers = (np.bincount(point_labels, weights=sums, minlength=n_clusters)
+               / np.bincount(point_labels, weights=counts, minlength=n_clusters))
+    return labels, centers
+
+
+def ckmeans_1d(values, n_clusters):
+    """
+    Computes an optimal k-means clustering of one-dimensional values.
+
+    Args:
+        values (array-like): The values to cluster.
+        n_clusters (int): Number of clusters.
+
+    Returns:
+        tuple: (labels, centers) -- an int32 label per value, ordered by
+               center, and the mean of each cluster in ascending order.
+
+    Raises:
+        ValueError: If there are no values or n_clusters < 1.
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if values.size == 0:
+        raise ValueError("Cannot cluster an empty array.")
+
+    # Duplicates become one weighted point; np.unique also sorts the values
+    distinct, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    n_clusters = _check_n_clusters(n_clusters, len(distinct))
+    starts = _optimal_cluster_starts(distinct, counts.astype(np.float64), n_clusters)
+
+    point_labels = (np.searchsorted(starts, np.arange(len(distinct)), side="right") - 1).astype(np.int32)
+    return _labels_and_centers(point_labels, inverse.ravel(), distinct * counts, counts, n_clusters)
+
+
+def histogram_kmeans_1d(values, n_clusters, bins=4096):
+    """
+    Approximates ckmeans_1d() in linear time by clustering a histogram.
+
+    Values are binned into `bins` equal-width bins and the optimal clustering
+    of the bin means (weighted by bin counts) is computed exactly, so cluster
+    boundaries are accurate to one bin width. No sort is needed.
+
+    Args:
+        values (array-like): The values to cluster.
+        n_clusters (int): Number of clusters.
+        bins (int): Number of histogram bins.
+
+    Returns:
+        tuple: (labels, centers) as for ckmeans_1d(); the centers are the
+               exact means of the returned clusters.
+
+    Raises:
+        ValueError: If there are no values or n_clusters < 1.
+    """
+    values = np.asarray(values).ravel()
+    if values.size == 0:
+        raise ValueError("Cannot cluster an empty array.")
+
+    low, high = values.min(), values.max()
+    scale = bins / (high - low) if high > low else 0.0
+    bin_index = np.minimum(((values - low) * scale).astype(np.intp), bins - 1)
+    counts = np.bincount(bin_index, minlength=bins).astype(np.float64)
+    sums = np.bincount(bin_index, weights=values, minlength=bins)
+
+    occupied = np.flatnonzero(counts)
+    n_clusters = _check_n_clusters(n_clusters, len(occupied))
+    starts = _optimal_cluster_starts(sums[occupied] / counts[occupied], counts[occupied], n_clusters)
+
+    bin_labels = np.zeros(bins, dtype=np.int32)
+    bin_labels[occupied] = np.searchsorted(starts, np.arange(len(occupied)), side="right") - 1
+    # Empty bins have no values, so their labels never reach the output
+    return _labels_and_centers(bin_labels, bin_index, sums, counts, n_clusters)
+
+
+def assign_to_centers(values, centers):
+    """
+    Labels each value with its nearest center.
+
+    Args:
+        values (array-like): The values to label.
+        centers (array-like): Cluster centers in ascending order.
+
+    Returns:
+        np.ndarray: int32 index of the nearest center for every value.
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    # In 1-D the nearest center changes exactly at the midpoints between centers
+    midpoints = (centers[1:] + centers[:-1]) / 2
+    return np.searchsorted(midpoints, np.asarray(values).ravel()).astype(np.int32)
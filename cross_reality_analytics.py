@@ -1,36 +1,142 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
 from sklearn.model_selection import train_test_split
-def analyze_cross_reality_data(aligned_realities):
+from reality_selection import select_top_realities
+
+# Stability estimators selectable per run. The forest is the original model;
+# histogram gradient boosting trains on binned features, so time and model
+# size grow far slower with the number of universes; Ridge is the baseline.
+STABILITY_MODELS = {
+    # Set n_jobs=-1 to use all available CPU cores for potentially faster training
+    "random-forest": lambda: RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1),
+    "gradient-boosting": lambda: HistGradientBoostingRegressor(random_state=42),
+    "linear": lambda: Ridge(),
+}
+TEST_SIZE = 0.2
+
+def make_stability_model(name):
+    """
+    Creates an unfitted estimator from STABILITY_MODELS.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name not in STABILITY_MODELS:
+        raise ValueError(f"Unknown stability model '{name}'. Expected one of {tuple(STABILITY_MODELS)}.")
+    return STABILITY_MODELS[name]()
+
+def analyze_cross_reality_data(aligned_realities, model_registry=None, stability_seed=None, model="random-forest"):
+    """
+    Predicts the stability of every Universe from its aligned reality clusters.
+
+    Args:
+        aligned_realities (pd.DataFrame): Output of align_realities().
+        model_registry (ModelRegistry, optional): Reuses a model already
+            trained on the same features and target instead of retraining.
+        stability_seed (int, optional): Seed for the placeholder stability
+            target. Without it the target is redrawn from the global NumPy
+            stream on every call, so a registry never finds a match.
+        model (str): Estimator from STABILITY_MODELS.
+
+    Returns:
+        pd.DataFrame: One row per Universe with the cluster features,
+        'Stability' and 'Predicted Stability'.
+    """
     # Prepare data for cross-reality analysis
-    analysis_df = aligned_realities.pivot(index='Universe', columns='Reality Cluster', values='Data')
-    
-    # Handle missing values (if any)
-    analysis_df.fillna(analysis_df.mean(), inplace=True)
+    features, universes, clusters = build_feature_matrix(aligned_realities)
     
-    # Define target variable (e.g., reality stability)
+    # Define target variable (e.g., reality stability), aligned with the feature rows by Universe
     target_variable = 'Stability'
-    analysis_df[target_variable] = pd.Series(np.random.rand(len(analysis_df))) # Replace with actual stability data
+    if stability_seed is None:
+        stability = np.random.rand(len(universes)) # Replace with actual stability data
+    else:
+        stability = np.random.default_rng(stability_seed).random(len(universes))
+    target = pd.Series(stability, index=universes, name=target_variable)
     
-    # Split data into training and testing sets
-    X_train, X_test, y_train, y_test = train_test_split(analysis_df.drop(target_variable, axis=1), analysis_df[target_variable], test_size=0.2, random_state=42)
+    estimator = make_stability_model(model)
     
-    # Train random forest regressor model
-    # Set n_jobs=-1 to use all available CPU cores for potentially faster training
-    model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1) # Added n_jobs
-    model.fit(X_train, y_train)
+    def train_model():
+        # Split data into training and testing sets
+        X_train, X_test, y_train, y_test = train_test_split(features, target.to_numpy(), test_size=TEST_SIZE, random_state=42)
+        
+        # Train the stability model
+        estimator.fit(X_train, y_train)
+        return estimator
     
-    # Predict stability scores for all realities
-    predicted_stability = model.predict(analysis_df.drop(target_variable, axis=1))
+    if model_registry is None:
+        fitted_model = train_model()
+    else:
+        params = {"model": model, "estimator": estimator.get_params(), "test_size": TEST_SIZE}
+        key = model_registry.key(features, target.to_numpy(), params, feature_names=clusters.tolist())
+        fitted_model = model_registry.get_or_fit(key, train_model)
     
-    # Create output dataframe with predicted stability scores
-    output_df = analysis_df.copy()
-    output_df['Predicted Stability'] = predicted_stability
+    # Create output dataframe with predicted stability scores; the features
+    # are wrapped without copying
+    output_df = pd.DataFrame(features, index=universes, columns=clusters, copy=False)
+    output_df[target_variable] = target
+    output_df['Predicted Stability'] = predict_stability(fitted_model, features)
     
     return output_df
-def identify_optimal_realities(output_df):
-    # Identify top 3 realities with highest predicted stability scores
-    optimal_realities = output_df.nlargest(3, 'Predicted Stability')
+def build_feature_matrix(aligned_realities, dtype=np.float32):
+    """
+    Builds the Universe x Reality Cluster feature matrix in one pass.
+
+    Equivalent to pivoting aligned_realities and filling gaps with the column
+    means, but writes straight into one C-contiguous array (float32 is what
+    the tree models train on, so they use it without converting) and imputes
+    in place.
+
+    Args:
+        aligned_realities (pd.DataFrame): Output of align_realities().
+        dtype (np.dtype): dtype of the matrix.
+
+    Returns:
+        tuple: (matrix, universes, clusters) -- the (n_universes, n_clusters)
+               matrix and the sorted Universe and cluster IDs labelling its
+               rows and columns.
+
+    Raises:
+        ValueError: If a (Universe, Reality Cluster) pair occurs twice.
+    """
+    universe_ids = aligned_realities['Universe']
+    if isinstance(universe_ids.dtype, pd.CategoricalDtype):
+        # Compact schema: only observed universes become rows
+        universe_ids = universe_ids.astype(universe_ids.cat.categories.dtype)
+    universe_codes, universes = pd.factorize(universe_ids, sort=True)
+    cluster_codes, clusters = pd.factorize(aligned_realities['Reality Cluster'], sort=True)
+    universes = pd.Index(universes, name='Universe')
+    clusters = pd.Index(clusters, name='Reality Cluster')
+
+    cells = universe_codes.astype(np.int64) * len(clusters) + cluster_codes
+    if len(np.unique(cells)) != len(cells):
+        raise ValueError("Index contains duplicate entries, cannot reshape")
+
+    matrix = np.full((len(universes), len(clusters)), np.nan, dtype=dtype)
+    matrix.reshape(-1)[cells] = aligned_realities['Data'].to_numpy()
+
+    # Handle missing values (if any): fill with the column mean
+    missing_rows, missing_columns = np.nonzero(np.isnan(matrix))
+    if len(missing_rows):
+        column_means = np.nanmean(matrix, axis=0)
+        matrix[missing_rows, missing_columns] = column_means[missing_columns]
+    return matrix, universes, clusters
+def predict_stability(model, features):
+    """
+    Prediction-only path: scores Universes with an already trained model.
+
+    Args:
+        model: Fitted regressor, e.g. from ModelRegistry.get().
+        features (np.ndarray): Feature matrix from build_feature_matrix().
+
+    Returns:
+        np.ndarray: Predicted stability per row.
+    """
+    return model.predict(features)
+def identify_optimal_realities(output_df, k=3, tie_break="first"):
+    # Identify top k realities with highest predicted stability scores;
+    # output_df may also be an iterable of scored chunks
+    optimal_realities = select_top_realities(output_df, k=k, tie_break=tie_break)
     
     return optimal_realities
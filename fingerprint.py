@@ -0,0 +1,84 @@
+"""
+Content fingerprints for arrays, DataFrames and parameter sets.
+
+A fingerprint is a hex digest that changes whenever the content changes, so
+it can key caches of results derived from that content (fitted centroids,
+pipeline stages). Numeric data is hashed straight from its buffer without
+copying; other columns go through pandas' stable value hashing.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+DIGEST_SIZE = 16 # bytes; 128 bits is plenty for cache keys
+
+# Contiguous blocks hashed per update call, so non-contiguous arrays are
+# copied a block at a time instead of all at once
+_HASH_BLOCK_ELEMENTS = 1 << 20
+
+
+def _update_with_array(hasher, array):
+    array = np.asarray(array)
+    hasher.update(f"{array.dtype.str}{array.shape}".encode())
+    flat = array.reshape(-1)
+    for start in range(0, flat.size, _HASH_BLOCK_ELEMENTS):
+        hasher.update(np.ascontiguousarray(flat[start:start + _HASH_BLOCK_ELEMENTS]))
+
+
+def _update_with_series(hasher, series):
+    hasher.update(f"{series.name}:{series.dtype}".encode())
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        _update_with_series(hasher, pd.Series(series.cat.categories, name="categories"))
+        _update_with_array(hasher, series.cat.codes.to_numpy())
+    elif series.dtype.kind in "biufcmM":
+        _update_with_array(hasher, series.to_numpy())
+    else:
+        _update_with_array(hasher, pd.util.hash_pandas_object(series, index=False).to_numpy())
+
+
+def fingerprint_array(array):
+    """
+    Fingerprints a NumPy array (including memory-mapped ones).
+
+    Args:
+        array (np.ndarray): Numeric array.
+
+    Returns:
+        str: Hex digest covering dtype, shape and values.
+    """
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    _update_with_array(hasher, array)
+    return hasher.hexdigest()
+
+
+def fingerprint_frame(df, columns=None):
+    """
+    Fingerprints the values of a DataFrame (the index is ignored).
+
+    Args:
+        df (pd.DataFrame): The data.
+        columns (list, optional): Columns to include; defaults to all.
+
+    Returns:
+        str: Hex digest covering column names, dtypes and values.
+    """
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for column in (df.columns if columns is None else columns):
+        _update_with_series(hasher, df[column])
+    return hasher.hexdigest()
+
+
+def fingerprint_params(params):
+    """
+    Fingerprints a JSON-serializable parameter dict, independent of key order.
+
+    Args:
+        params (dict): Parameters.
+
+    Returns:
+        str: Hex digest of the canonical JSON encoding.
+    """
+    encoded = json.dumps(params, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=DIGEST_SIZE).hexdigest()
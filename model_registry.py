@@ -0,0 +1,124 @@
+"""
+On-disk registry of fitted models keyed by what they were trained on.
+
+A key is a fingerprint of the feature schema, the training data and the
+model parameters, so an identical training run can be skipped by loading
+the stored model. Models are saved uncompressed with joblib so their NumPy
+arrays can be memory-mapped on load. Loaded models are also kept in a small
+in-memory LRU, and the oldest files are evicted past `max_entries`.
+"""
+import os
+from collections import OrderedDict
+from contextlib import suppress
+
+import joblib
+import numpy as np
+
+from atomic_write import atomic_write
+from fingerprint import fingerprint_array, fingerprint_frame, fingerprint_params
+
+MODEL_FILE_SUFFIX = ".joblib"
+
+
+class ModelRegistry:
+    """Persists fitted models by training fingerprint, with LRU eviction."""
+    def __init__(self, directory, max_entries=32, memory_entries=4, mmap_mode="r"):
+        """
+        Args:
+            directory (str): Directory holding the model files; created if missing.
+            max_entries (int): Model files kept on disk; the least recently
+                               used are removed.
+            memory_entries (int): Loaded models kept in memory.
+            mmap_mode (str, optional): joblib mmap_mode used when loading
+                                       ("r" shares arrays via the page cache;
+                                       None reads them into memory).
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.mmap_mode = mmap_mode
+        self._loaded = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(features, target, params, feature_names=None):
+        """
+        Builds the registry key of a training run.
+
+        Args:
+            features (pd.DataFrame or np.ndarray): Training features; column
+                                     names and dtypes form the feature schema.
+            target (np.ndarray): Training target.
+            params (dict): JSON-serializable model and training parameters.
+            feature_names (list, optional): Column names of an ndarray `features`.
+
+        Returns:
+            str: Hex key.
+        """
+        if isinstance(features, np.ndarray):
+            schema = [[str(name), str(features.dtype)] for name in (feature_names or range(features.shape[1]))]
+            features_fingerprint = fingerprint_array(features)
+        else:
+            schema = [[str(column), str(dtype)] for column, dtype in features.dtypes.items()]
+            features_fingerprint = fingerprint_frame(features)
+        return fingerprint_params({
+            "schema": schema,
+            "features": features_fingerprint,
+            "target": fingerprint_array(target),
+            "params": params,
+        })
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}{MODEL_FILE_SUFFIX}")
+
+    def _remember(self, key, model):
+        self._loaded[key] = model
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.memory_entries:
+            self._loaded.popitem(last=False)
+
+    def get(self, key):
+        """Returns the model stored under `key`, or None."""
+        path = self._path(key)
+        if key in self._loaded:
+            self._loaded.move_to_end(key)
+            # The file's mtime is the recency put() evicts by, so in-memory hits count too
+            with suppress(FileNotFoundError):
+                os.utime(path)
+            return self._loaded[key]
+        if not os.path.exists(path):
+            return None
+        model = joblib.load(path, mmap_mode=self.mmap_mode)
+        os.utime(path) # Mark as recently used for eviction
+        self._remember(key, model)
+        return model
+
+    def put(self, key, model):
+        """Stores a fitted model under `key` and evicts the least recently used files."""
+        path = self._path(key)
+        with atomic_write(path) as f:
+            joblib.dump(model, f)
+        self._remember(key, model)
+
+        stored = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                  if name.endswith(MODEL_FILE_SUFFIX)]
+        for stale_path in sorted(stored, key=os.path.getmtime)[:-self.max_entries]:
+            os.remove(stale_path)
+            self._loaded.pop(os.path.basename(stale_path)[:-len(MODEL_FILE_SUFFIX)], None)
+
+    def get_or_fit(self, key, fit):
+        """
+        Returns the model stored under `key`, fitting and storing it first if needed.
+
+        Args:
+            key (str): Registry key, see key().
+            fit (callable): Called without arguments to train the model on a miss.
+
+        Returns:
+            The fitted model.
+        """
+        model = self.get(key)
+        if model is None:
+            model = fit()
+            self.put(key, model)
+        return model
@@ -1,7 +1,15 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 from scipy.stats import norm
-from typing import Tuple
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from atomic_write import atomic_write
+
 # import quantum_entanglement_utils # Commented out as the module is missing
 
 def ingest_multiverse_data(
@@ -9,7 +17,13 @@ def ingest_multiverse_data(
     num_realities_per_universe: int = 3,
     num_datapoints_per_reality: int = 1000,
     remove_outliers: bool = False,
-    outlier_std_dev_threshold: float = 3.0
+    outlier_std_dev_threshold: float = 3.0,
+    compact: bool = False,
+    categorical_ids: bool = False,
+    data_dtype: np.dtype = np.float64,
+    outliers_by_group: bool = False,
+    seed: Optional[int] = None,
+    workers: int = 1
 ) -> pd.DataFrame:
     """
     Generates or ingests data representing multiple universes and realities.
@@ -20,6 +34,17 @@ def ingest_multiverse_data(
         num_datapoints_per_reality: The number of data points for each reality.
         remove_outliers: If True, removes outliers based on standard deviation.
         outlier_std_dev_threshold: The number of standard deviations to use for outlier cutoff.
+        compact: If True, stores 'Universe' and 'Reality' as the smallest
+            unsigned integer type that fits instead of int64.
+        categorical_ids: If True, stores 'Universe' and 'Reality' as
+            categoricals (takes precedence over `compact`).
+        data_dtype: dtype of the 'Data' column, e.g. np.float32 to halve it.
+        outliers_by_group: If True, outliers are judged against the mean and
+            standard deviation of their own (Universe, Reality) group.
+        seed: If given, every universe draws from its own generator spawned
+            from SeedSequence(seed), so the data is reproducible and identical
+            for any `workers`. None uses the global NumPy random stream.
+        workers: Threads filling universes in parallel (seeded data only).
 
     Returns:
         A pandas DataFrame containing the multiverse data with columns
@@ -30,19 +55,18 @@ def ingest_multiverse_data(
     # Generate random multiverse data (placeholder - replace with actual data source/simulation)
     # Example: Using standard normal distribution instead of uniform
     # multiverse_data = np.random.randn(*multiverse_shape)
-    multiverse_data = np.random.rand(*multiverse_shape)
+    if seed is None:
+        multiverse_data = np.random.rand(*multiverse_shape)
+    else:
+        multiverse_data = fill_multiverse_data(np.empty(multiverse_shape, dtype=data_dtype), seed, workers=workers)
 
     # Create pandas dataframe for easier manipulation
-    df = pd.DataFrame({
-        'Universe': np.repeat(range(num_universes), num_realities_per_universe * num_datapoints_per_reality),
-        'Reality': np.tile(np.repeat(range(num_realities_per_universe), num_datapoints_per_reality), num_universes),
-        'Data': multiverse_data.flatten()
-    })
+    df = _multiverse_frame(0, multiverse_data.reshape(-1), multiverse_shape, compact, categorical_ids, data_dtype)
 
     if remove_outliers:
         print(f"Removing outliers beyond {outlier_std_dev_threshold} standard deviations...")
         initial_rows = len(df)
-        df = correct_data_outliers(df, std_dev_threshold=outlier_std_dev_threshold)
+        df = correct_data_outliers(df, std_dev_threshold=outlier_std_dev_threshold, by_group=outliers_by_group)
         print(f"Removed {initial_rows - len(df)} outlier rows.")
 
     # Apply quantum entanglement-based data correction (optional)
@@ -50,18 +74,485 @@ def ingest_multiverse_data(
 
     return df
 
-def correct_data_outliers(df: pd.DataFrame, std_dev_threshold: float = 3.0) -> pd.DataFrame:
-    """Removes outliers from the 'Data' column based on standard deviation."""
-    mean = df['Data'].mean()
-    std = df['Data'].std()
-    cut_off = std_dev_threshold * std
-    lower = mean - cut_off
-    upper = mean + cut_off
-    # Return a copy to avoid modifying the original DataFrame slice implicitly
-    return df[(df['Data'] > lower) & (df['Data'] < upper)].copy()
+def iter_multiverse_data(
+    num_universes: int = 5,
+    num_realities_per_universe: int = 3,
+    num_datapoints_per_reality: int = 1000,
+    chunk_rows: int = 1_000_000,
+    compact: bool = False,
+    categorical_ids: bool = False,
+    data_dtype: np.dtype = np.float64,
+    remove_outliers: bool = False,
+    outlier_std_dev_threshold: float = 3.0,
+    outliers_by_group: bool = False,
+    seed: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Generates the same data as ingest_multiverse_data() as a stream of
+    bounded-size DataFrame chunks.
+
+    Values are drawn from the same random streams in the same row order, so
+    for the same `seed` (or, unseeded, after the same np.random.seed(...))
+    the concatenated chunks equal the monolithic DataFrame.
+
+    Args:
+        num_universes: The number of parallel universes to simulate.
+        num_realities_per_universe: The number of realities within each universe.
+        num_datapoints_per_reality: The number of data points for each reality.
+        chunk_rows: The maximum number of rows per chunk.
+        compact, categorical_ids, data_dtype: Column schema; see
+            ingest_multiverse_data(). Categorical chunks share the full set of
+            categories, so they concatenate without losing the dtype.
+        remove_outliers, outlier_std_dev_threshold, outliers_by_group: Outlier
+            removal; see ingest_multiverse_data(). Done in two streaming
+            passes (see filter_outliers_streaming), regenerating the chunks
+            for the second pass, so memory stays bounded by `chunk_rows`.
+        seed: Per-universe seeded streams; see ingest_multiverse_data().
+
+    Yields:
+        pandas DataFrames with columns ['Universe', 'Reality', 'Data'] and a
+        RangeIndex continuing across chunks (with gaps where outliers were removed).
+    """
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive.")
+    multiverse_shape = (num_universes, num_realities_per_universe, num_datapoints_per_reality)
+    total_rows = num_universes * num_realities_per_universe * num_datapoints_per_reality
+
+    rows_per_universe = num_realities_per_universe * num_datapoints_per_reality
+
+    def global_stream_rows(random_state):
+        return lambda start, stop: random_state.rand(stop - start)
+
+    def seeded_rows():
+        generators = universe_generators(seed, num_universes)
+        def draw(start, stop):
+            # A chunk may span universes; each part continues its universe's stream
+            data = np.empty(stop - start, dtype=data_dtype)
+            position = start
+            while position < stop:
+                universe = position // rows_per_universe
+                end = min(stop, (universe + 1) * rows_per_universe)
+                _draw_uniform(generators[universe], data[position - start:end - start])
+                position = end
+            return data
+        return draw
+
+    def generate_chunks(draw_rows):
+        for start in range(0, total_rows, chunk_rows):
+            stop = min(start + chunk_rows, total_rows)
+            yield _multiverse_frame(start, draw_rows(start, stop), multiverse_shape,
+                                    compact, categorical_ids, data_dtype)
+
+    if seed is not None:
+        # Fresh generators per pass replay the same values
+        sources = (seeded_rows(), seeded_rows())
+    else:
+        # The statistics pass draws from the global stream as usual; the filter
+        # pass replays the same values from a copy of the starting state.
+        replay = np.random.RandomState()
+        replay.set_state(np.random.get_state())
+        sources = (global_stream_rows(np.random), global_stream_rows(replay))
+
+    if not remove_outliers:
+        yield from generate_chunks(sources[0])
+        return
+
+    passes = iter(sources)
+    yield from filter_outliers_streaming(lambda: generate_chunks(next(passes)),
+                                         std_dev_threshold=outlier_std_dev_threshold, by_group=outliers_by_group)
+
+def universe_generators(seed: int, num_universes: int) -> list:
+    """
+    Creates one independent np.random.Generator per universe.
+
+    Universe u always gets child u of SeedSequence(seed), so its values do not
+    depend on how many universes are generated or by how many workers.
+    """
+    return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(num_universes)]
+
+def _draw_uniform(generator: np.random.Generator, out: np.ndarray) -> None:
+    """Fills `out` in place with uniform [0, 1) values from `generator`."""
+    if out.dtype in (np.float32, np.float64):
+        generator.random(dtype=out.dtype, out=out)
+    else:
+        out[:] = generator.random(out.size)
+
+def fill_multiverse_data(out: np.ndarray, seed: int, workers: int = 1) -> np.ndarray:
+    """
+    Fills a preallocated (universes, realities, datapoints) array (or memmap)
+    with seeded multiverse data, one universe per task.
+
+    NumPy releases the GIL while filling arrays, so a thread pool scales
+    across cores without copying data between processes.
+
+    Args:
+        out: C-contiguous float32/float64 array to fill.
+        seed: Root seed; see universe_generators().
+        workers: Number of threads; the result is identical for any value.
+
+    Returns:
+        `out`, filled.
+    """
+    generators = universe_generators(seed, out.shape[0])
+
+    def fill(universe):
+        _draw_uniform(generators[universe], out[universe].reshape(-1))
+
+    if workers > 1 and out.shape[0] > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fill, range(out.shape[0])))
+    else:
+        for universe in range(out.shape[0]):
+            fill(universe)
+    return out
+
+def _id_column(ids: np.ndarray, num_ids: int, compact: bool, categorical: bool):
+    """Stores an ID column as int64, the smallest fitting unsigned int, or a categorical."""
+    if categorical:
+        return pd.Categorical.from_codes(ids, categories=np.arange(num_ids, dtype=np.min_scalar_type(max(num_ids - 1, 0))))
+    if compact:
+        return ids.astype(np.min_scalar_type(max(num_ids - 1, 0)))
+    return ids
+
+def _multiverse_frame(
+    start_row: int,
+    data: np.ndarray,
+    multiverse_shape: Tuple[int, int, int],
+    compact: bool = False,
+    categorical_ids: bool = False,
+    data_dtype: np.dtype = np.float64
+) -> pd.DataFrame:
+    """Builds the rows [start_row, start_row + len(data)) of the multiverse DataFrame."""
+    num_universes, num_realities_per_universe, num_datapoints_per_reality = multiverse_shape
+    rows = np.arange(start_row, start_row + len(data))
+    reality_rows = rows // num_datapoints_per_reality
+    return pd.DataFrame({
+        'Universe': _id_column(reality_rows // num_realities_per_universe, num_universes, compact, categorical_ids),
+        'Reality': _id_column(reality_rows % num_realities_per_universe, num_realities_per_universe, compact, categorical_ids),
+        'Data': data.astype(data_dtype, copy=False)
+    }, index=pd.RangeIndex(start_row, start_row + len(data)), copy=False)
+
+def compact_multiverse_frame(
+    df: pd.DataFrame,
+    categorical_ids: bool = False,
+    data_dtype: np.dtype = None
+) -> pd.DataFrame:
+    """
+    Converts an existing multiverse (or quantum results) DataFrame to the
+    compact schema produced by ingest_multiverse_data(compact=True).
+
+    Args:
+        df: DataFrame with any of the columns 'Universe', 'Reality', 'Data'.
+        categorical_ids: If True, ID columns become categoricals instead of
+            the smallest fitting unsigned integer type.
+        data_dtype: If given, the dtype to cast 'Data' to (e.g. np.float32).
+
+    Returns:
+        A new DataFrame with compact column dtypes; other columns are unchanged.
+    """
+    columns = {}
+    for column in ('Universe', 'Reality'):
+        if column not in df or df.empty:
+            continue
+        ids = df[column]
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            ids = ids.astype(ids.cat.categories.dtype)
+        if categorical_ids:
+            columns[column] = ids.astype('category')
+        elif ids.min() >= 0:
+            columns[column] = ids.astype(np.min_scalar_type(int(ids.max())))
+    if data_dtype is not None and 'Data' in df:
+        columns['Data'] = df['Data'].astype(data_dtype)
+    return df.assign(**columns)
+
+# --- Streaming Statistics and Outlier Removal ---
+OUTLIER_GROUP_COLUMNS = ['Universe', 'Reality']
+
+class RunningStats:
+    """
+    Online mean/variance of a stream of values (Welford's algorithm, merging
+    whole chunks at once with Chan et al.'s parallel update).
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # Sum of squared deviations from the mean
+
+    def update(self, values: np.ndarray) -> "RunningStats":
+        """Adds a chunk of values to the statistics."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return self
+        chunk = RunningStats()
+        chunk.count = values.size
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(np.square(values - chunk.mean).sum())
+        return self.merge(chunk)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combines the statistics of another (disjoint) stream into this one."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1, matching pandas); NaN for fewer than 2 values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)."""
+        return float(np.sqrt(self.variance))
+
+class GroupedRunningStats:
+    """
+    RunningStats for every (Universe, Reality) group of a chunked DataFrame
+    stream, kept as one DataFrame so each chunk is merged with vector operations.
+    """
+    def __init__(self, group_columns=OUTLIER_GROUP_COLUMNS):
+        self.group_columns = list(group_columns)
+        self.stats = None # DataFrame indexed by group with count/mean/m2 columns
+
+    def update(self, chunk: pd.DataFrame) -> "GroupedRunningStats":
+        """Adds a chunk's 'Data' values to the statistics of their groups."""
+        # Accumulate in float64 even for float32 (compact) data
+        grouped = chunk['Data'].astype(np.float64).groupby([chunk[c] for c in self.group_columns], observed=True)
+        chunk_stats = pd.DataFrame({'count': grouped.count(), 'mean': grouped.mean()})
+        chunk_stats['m2'] = grouped.var(ddof=0).fillna(0.0) * chunk_stats['count']
+        if self.stats is None:
+            self.stats = chunk_stats
+            return self
+
+        groups = self.stats.index.union(chunk_stats.index)
+        old = self.stats.reindex(groups, fill_value=0.0)
+        new = chunk_stats.reindex(groups, fill_value=0.0)
+        total = old['count'] + new['count']
+        delta = new['mean'] - old['mean']
+        self.stats = pd.DataFrame({
+            'count': total,
+            'mean': old['mean'] + delta * new['count'] / total,
+            'm2': old['m2'] + new['m2'] + delta * delta * old['count'] * new['count'] / total,
+        })
+        return self
+
+    def bounds(self, std_dev_threshold: float) -> pd.DataFrame:
+        """Per-group (lower, upper) outlier limits at `std_dev_threshold` std devs."""
+        std = np.sqrt(self.stats['m2'] / (self.stats['count'] - 1).where(self.stats['count'] > 1))
+        cut_off = std_dev_threshold * std
+        return pd.DataFrame({'lower': self.stats['mean'] - cut_off, 'upper': self.stats['mean'] + cut_off})
+
+def _inlier_mask(chunk: pd.DataFrame, stats, std_dev_threshold: float) -> np.ndarray:
+    """Marks the rows of `chunk` inside the outlier limits of `stats`."""
+    data = chunk['Data'].to_numpy()
+    if isinstance(stats, RunningStats):
+        return np.abs(data - stats.mean) < std_dev_threshold * stats.std
+    bounds = stats.bounds(std_dev_threshold)
+    positions = bounds.index.get_indexer(pd.MultiIndex.from_frame(chunk[stats.group_columns]))
+    return (data > bounds['lower'].to_numpy()[positions]) & (data < bounds['upper'].to_numpy()[positions])
+
+def correct_data_outliers(df: pd.DataFrame, std_dev_threshold: float = 3.0, by_group: bool = False) -> pd.DataFrame:
+    """
+    Removes outliers from the 'Data' column based on standard deviation.
+
+    Args:
+        df: Multiverse DataFrame.
+        std_dev_threshold: The number of standard deviations to use for outlier cutoff.
+        by_group: If True, uses the mean/std of each (Universe, Reality) group.
+
+    Returns:
+        A new DataFrame without the outlier rows.
+    """
+    stats = GroupedRunningStats().update(df) if by_group else RunningStats().update(df['Data'].to_numpy())
+    # Boolean indexing already returns a new DataFrame, so no extra copy is needed
+    return df[_inlier_mask(df, stats, std_dev_threshold)]
+
+def filter_outliers_streaming(
+    make_chunks: Callable[[], Iterable[pd.DataFrame]],
+    std_dev_threshold: float = 3.0,
+    by_group: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Removes outliers from a chunked multiverse stream in two passes: the first
+    accumulates (per-group) running statistics, the second filters each chunk.
+    Only one chunk is in memory at a time, so it works on datasets larger than RAM.
+
+    Args:
+        make_chunks: Called once per pass; must return an iterable yielding
+            the same chunks both times (e.g. lambda: iter_multiverse_store(path)).
+        std_dev_threshold: The number of standard deviations to use for outlier cutoff.
+        by_group: If True, uses the mean/std of each (Universe, Reality) group.
+
+    Yields:
+        The chunks with outlier rows removed; same result as
+        correct_data_outliers() on the concatenated stream.
+    """
+    stats = GroupedRunningStats() if by_group else RunningStats()
+    seen_rows = 0
+    for chunk in make_chunks():
+        stats.update(chunk if by_group else chunk['Data'].to_numpy())
+        seen_rows += len(chunk)
+    if seen_rows == 0:
+        return
+    for chunk in make_chunks():
+        yield chunk[_inlier_mask(chunk, stats, std_dev_threshold)]
+# ------------------------------------------------
+
+# --- On-disk Multiverse Store ---
+# A store is a directory holding the raw (universes, realities, datapoints)
+# array as a .npy file plus a JSON file with its shape, dtype and seed. Every
+# consumer memory-maps the same file, so several processes share one copy of
+# the data through the OS page cache instead of regenerating it.
+STORE_DATA_FILE = "data.npy"
+STORE_META_FILE = "meta.json"
+
+def write_multiverse_store(
+    path: str,
+    num_universes: int = 5,
+    num_realities_per_universe: int = 3,
+    num_datapoints_per_reality: int = 1000,
+    seed: Optional[int] = None,
+    data_dtype: np.dtype = np.float64,
+    chunk_rows: int = 1_000_000,
+    workers: int = 1
+) -> dict:
+    """
+    Generates multiverse data straight into an on-disk store, chunk by chunk,
+    without holding the whole array in memory.
+
+    Args:
+        path: Directory of the store; created if missing.
+        num_universes: The number of parallel universes to simulate.
+        num_realities_per_universe: The number of realities within each universe.
+        num_datapoints_per_reality: The number of data points for each reality.
+        seed: Seed for the data; the values equal
+            ingest_multiverse_data(seed=seed). None uses the global NumPy
+            random stream.
+        data_dtype: dtype of the stored data.
+        chunk_rows: Rows generated per step (unseeded data only).
+        workers: Threads filling universes in parallel (seeded data only).
+
+    Returns:
+        The store's metadata dict.
+    """
+    os.makedirs(path, exist_ok=True)
+    multiverse_shape = (num_universes, num_realities_per_universe, num_datapoints_per_reality)
+
+    # meta.json marks a complete store: fill a temporary data file, drop any
+    # old metadata before swapping the data in, and write the new metadata
+    # last, so a crash or a concurrent open never pairs new data with old
+    # metadata
+    tmp_data_path = os.path.join(path, STORE_DATA_FILE + ".tmp")
+    data = np.lib.format.open_memmap(tmp_data_path, mode="w+", dtype=data_dtype, shape=multiverse_shape)
+    if seed is None:
+        flat = data.reshape(-1)
+        for start in range(0, flat.size, chunk_rows):
+            stop = min(start + chunk_rows, flat.size)
+            flat[start:stop] = np.random.rand(stop - start)
+        del flat
+    else:
+        fill_multiverse_data(data, seed, workers=workers)
+    data.flush()
+    del data
+    meta_path = os.path.join(path, STORE_META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    os.replace(tmp_data_path, os.path.join(path, STORE_DATA_FILE))
+
+    meta = {
+        "shape": list(multiverse_shape),
+        "dtype": np.dtype(data_dtype).name,
+        "seed": seed,
+        "seeding": "global" if seed is None else "SeedSequence.spawn per universe",
+        "columns": ["Universe", "Reality", "Data"],
+    }
+    with atomic_write(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+def open_multiverse_store(path: str) -> Tuple[np.ndarray, dict]:
+    """
+    Memory-maps a store read-only.
+
+    Args:
+        path: Directory written by write_multiverse_store().
+
+    Returns:
+        A tuple (data, meta): the (universes, realities, datapoints) memmap and
+        the metadata dict.
+
+    Raises:
+        FileNotFoundError: If the store is missing or incomplete.
+        ValueError: If the data does not match its metadata.
+    """
+    meta_path = os.path.join(path, STORE_META_FILE)
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"No multiverse store at '{path}' (missing {STORE_META_FILE}).")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    data = np.load(os.path.join(path, STORE_DATA_FILE), mmap_mode="r")
+    if list(data.shape) != meta["shape"] or data.dtype.name != meta["dtype"]:
+        raise ValueError(f"Multiverse store '{path}' data {data.shape}/{data.dtype} does not match its metadata.")
+    return data, meta
+
+def load_multiverse_store(path: str, compact: bool = False, categorical_ids: bool = False) -> pd.DataFrame:
+    """
+    Opens a store as a multiverse DataFrame whose 'Data' column is a zero-copy
+    view of the memory-mapped file.
+
+    Args:
+        path: Directory written by write_multiverse_store().
+        compact, categorical_ids: ID column schema; see ingest_multiverse_data().
+
+    Returns:
+        A pandas DataFrame with columns ['Universe', 'Reality', 'Data'].
+    """
+    data, meta = open_multiverse_store(path)
+    return _multiverse_frame(0, data.reshape(-1), tuple(meta["shape"]), compact, categorical_ids, data.dtype)
+
+def iter_multiverse_store(
+    path: str,
+    chunk_rows: int = 1_000_000,
+    compact: bool = False,
+    categorical_ids: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a store as DataFrame chunks whose 'Data' columns are views of the
+    memory-mapped file; same chunk layout as iter_multiverse_data().
+    """
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive.")
+    data, meta = open_multiverse_store(path)
+    flat = data.reshape(-1)
+    for start in range(0, flat.size, chunk_rows):
+        yield _multiverse_frame(start, flat[start:start + chunk_rows], tuple(meta["shape"]),
+                                compact, categorical_ids, data.dtype)
+# --------------------------------
 
 # Example usage block: Only runs when the script is executed directly
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate multiverse data.")
+    parser.add_argument("--write-store", metavar="PATH", help="Write the data to an on-disk store instead of printing a demo.")
+    parser.add_argument("--universes", type=int, default=5)
+    parser.add_argument("--realities", type=int, default=3)
+    parser.add_argument("--datapoints", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--float32", action="store_true", help="Store the data as float32.")
+    parser.add_argument("--workers", type=int, default=1, help="Threads generating seeded universes in parallel.")
+    args = parser.parse_args()
+
+    if args.write_store:
+        meta = write_multiverse_store(args.write_store, args.universes, args.realities, args.datapoints,
+                                      seed=args.seed, data_dtype=np.float32 if args.float32 else np.float64,
+                                      workers=args.workers)
+        print(f"Wrote multiverse store to {args.write_store}: {meta}")
+        raise SystemExit(0)
+
     print("Running multiverse_ingestion directly for demonstration...")
     # Example: Generate data with default parameters and remove outliers
     generated_df = ingest_multiverse_data(remove_outliers=True)
@@ -1,9 +1,18 @@
+import argparse
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 
 # Import the function to generate data dynamically
-from multiverse_ingestion import ingest_multiverse_data
+from fingerprint import fingerprint_frame
+from multiverse_ingestion import ingest_multiverse_data, load_multiverse_store
+from multiverse_results_writer import MultiverseResultsWriter
 from qiskit import QuantumCircuit, transpile
+from qiskit.quantum_info import Statevector
 
 # Import the Aer simulator from qiskit_aer
 try:
@@ -12,12 +21,6 @@ except ImportError:
     print("Please install qiskit-aer: pip install qiskit-aer")
     exit()
 
-# Generate multiverse data instead of loading from CSV
-print("Generating multiverse data...")
-df = ingest_multiverse_data() # Use default parameters or specify as needed
-print(f"Generated {len(df)} data points.")
-# Convert data to qubit inputs (0/1)
-df['Data'] = np.where(df['Data'] > 0.5, 1, 0)
 # Create quantum circuit
 def create_quantum_circuit(data):
     qc = QuantumCircuit(1)
@@ -26,34 +29,376 @@ def create_quantum_circuit(data):
     qc.h(0)  # Apply H gate for superposition
     return qc
 
-# Initialize the simulator once outside the loop for efficiency
-simulator = AerSimulator()
+def compile_circuit_templates(simulator):
+    """
+    Builds and transpiles the circuit for each possible qubit input exactly once.
 
-# Apply quantum gates to data
-quantum_data = []
-print("\nStarting quantum simulations...")
-try:
-    for index, row in df.iterrows():
-        try:
-            qc = create_quantum_circuit(row['Data'])
-            # Add measurement - required for getting counts from simulator
-            qc.measure_all()
-            # Compile the circuit for the simulator
-            compiled_circuit = transpile(qc, simulator)
-            # Run the simulation using simulator.run()
-            result = simulator.run(compiled_circuit, shots=1).result()
-            counts = result.get_counts(compiled_circuit)
-            quantum_data.append([row['Universe'], row['Reality'], list(counts.keys())[0]])
-        except Exception as e:
-            print(f"Error during simulation for row {index} (Universe: {row.get('Universe', 'N/A')}, Reality: {row.get('Reality', 'N/A')}): {e}")
-            # Decide if you want to continue or stop on error
-            # continue # Uncomment to skip problematic rows
-            # break    # Uncomment to stop the loop on the first error
-except Exception as loop_error:
-    print(f"\nAn unexpected error occurred outside the inner simulation loop: {loop_error}")
-    # Optionally re-raise the error if you want the script to stop completely
-    # raise loop_error
-# Save quantum results
-quantum_df = pd.DataFrame(quantum_data, columns=['Universe', 'Reality', 'Quantum_State'])
-quantum_df.to_csv('multiverse_quantum_results.csv', index=False)
-print("Quantum analysis complete. Results saved to multiverse_quantum_results.csv")
+    Every row maps its data bit to one of only two circuits, so these compiled
+    templates are reused for the whole DataFrame.
+
+    Args:
+        simulator: The Aer backend to transpile for.
+
+    Returns:
+        dict: Maps each data bit (0 or 1) to its compiled, measured circuit.
+    """
+    templates = {}
+    for data in (0, 1):
+        qc = create_quantum_circuit(data)
+        # Add measurement - required for getting results from simulator
+        qc.measure_all()
+        templates[data] = transpile(qc, simulator)
+    return templates
+
+def simulate_batched(qubit_inputs, simulator, templates, seed=None):
+    """
+    Simulates one measurement per row with a single memory-enabled Aer job.
+
+    Both templates are submitted together with enough shots for the more
+    common input; row i takes the next unused shot from its template's memory.
+
+    Args:
+        qubit_inputs (np.ndarray): The 0/1 input of each row.
+        simulator: The Aer backend to run on.
+        templates (dict): Compiled circuits from compile_circuit_templates().
+        seed (int, optional): Seed for the simulator.
+
+    Returns:
+        np.ndarray: The measured state (0 or 1) of each row as uint8.
+    """
+    quantum_states = np.empty(len(qubit_inputs), dtype=np.uint8)
+    rows_per_template = {data: np.flatnonzero(qubit_inputs == data) for data in templates}
+    rows_per_template = {data: rows for data, rows in rows_per_template.items() if rows.size}
+    if not rows_per_template:
+        return quantum_states
+
+    circuits = [templates[data] for data in rows_per_template]
+    shots = max(rows.size for rows in rows_per_template.values())
+    result = simulator.run(circuits, shots=shots, memory=True, seed_simulator=seed).result()
+
+    for circuit, rows in zip(circuits, rows_per_template.values()):
+        memory = result.get_memory(circuit)[:rows.size]
+        quantum_states[rows] = np.asarray(memory).astype(np.uint8)
+    return quantum_states
+
+def template_probabilities():
+    """
+    Computes the exact measurement distribution of each circuit template.
+
+    Returns:
+        np.ndarray: Shape (2, 2); row `data` holds [P(measure 0), P(measure 1)]
+                    for the circuit built by create_quantum_circuit(data).
+    """
+    return np.array([Statevector(create_quantum_circuit(data)).probabilities() for data in (0, 1)])
+
+def simulate_vectorized(qubit_inputs, rng, chunk_rows=1 << 22):
+    """
+    Draws every row's measurement directly from its template's known
+    distribution, without running any circuit.
+
+    Args:
+        qubit_inputs (np.ndarray): The 0/1 input of each row.
+        rng (np.random.Generator): Seeded source of randomness.
+        chunk_rows (int): Rows drawn per step, to bound temporary memory.
+
+    Returns:
+        np.ndarray: The measured state (0 or 1) of each row as uint8.
+    """
+    prob_one = template_probabilities()[:, 1]
+    quantum_states = np.empty(len(qubit_inputs), dtype=np.uint8)
+    for start in range(0, len(qubit_inputs), chunk_rows):
+        stop = start + chunk_rows
+        draws = rng.random(len(quantum_states[start:stop]))
+        np.less(draws, prob_one[qubit_inputs[start:stop]], out=quantum_states[start:stop], casting="unsafe")
+    return quantum_states
+
+def validate_against_aer(qubit_inputs, quantum_states, sample_size, rng, seed=None, z_threshold=4.0):
+    """
+    Spot-checks vectorized results by re-simulating a random subsample on Aer.
+
+    For each template, the fraction of 1s measured on Aer and the fraction in
+    the vectorized results for the same rows are both compared with the exact
+    probability using a binomial z-score.
+
+    Args:
+        qubit_inputs (np.ndarray): The 0/1 input of each row.
+        quantum_states (np.ndarray): Vectorized measurement of each row.
+        sample_size (int): Number of rows to re-simulate.
+        rng (np.random.Generator): Source of randomness for the subsample.
+        seed (int, optional): Seed for the simulator.
+        z_threshold (float): Largest |z| accepted as agreement.
+
+    Returns:
+        tuple: (passed, report) where `report` lists one dict per template.
+    """
+    sample_rows = rng.choice(len(qubit_inputs), size=min(sample_size, len(qubit_inputs)), replace=False)
+    sample_inputs = qubit_inputs[sample_rows]
+
+    simulator = AerSimulator()
+    aer_states = simulate_batched(sample_inputs, simulator, compile_circuit_templates(simulator), seed=seed)
+
+    prob_one = template_probabilities()[:, 1]
+    report = []
+    for data in (0, 1):
+        in_template = sample_inputs == data
+        n = int(in_template.sum())
+        if n == 0:
+            continue
+        std_err = np.sqrt(prob_one[data] * (1 - prob_one[data]) / n)
+        aer_fraction = aer_states[in_template].mean()
+        vectorized_fraction = quantum_states[sample_rows][in_template].mean()
+        report.append({
+            'data': data,
+            'rows': n,
+            'expected': float(prob_one[data]),
+            'aer': float(aer_fraction),
+            'vectorized': float(vectorized_fraction),
+            'aer_z': float((aer_fraction - prob_one[data]) / std_err) if std_err > 0 else 0.0,
+            'vectorized_z': float((vectorized_fraction - prob_one[data]) / std_err) if std_err > 0 else 0.0,
+        })
+    passed = all(abs(r['aer_z']) < z_threshold and abs(r['vectorized_z']) < z_threshold for r in report)
+    return passed, report
+
+# Simulator and compiled templates reused by every shard a worker process runs
+_worker_backend = None
+
+def _get_worker_backend():
+    """Returns this process's AerSimulator and compiled templates, creating them once."""
+    global _worker_backend
+    if _worker_backend is None:
+        simulator = AerSimulator()
+        _worker_backend = (simulator, compile_circuit_templates(simulator))
+    return _worker_backend
+
+# Leading spawn-key entry of the shard streams. multiverse_ingestion draws
+# universe u's data from child u of SeedSequence(seed), i.e. spawn_key (u,);
+# the tag keeps the analysis streams apart from those when both share a seed,
+# so the measurements cannot replay the uniforms that produced 'Data'.
+SHARD_STREAM_TAG = 1
+
+def shard_seed_sequence(root_entropy, universe):
+    """
+    Derives the independent seed stream of one universe shard.
+
+    The stream depends only on the run's root entropy and the universe ID, so
+    results do not change with the number of workers or the shard order.
+
+    Args:
+        root_entropy (int): Entropy of the run's root SeedSequence.
+        universe (int): The universe ID of the shard.
+
+    Returns:
+        np.random.SeedSequence: The shard's seed sequence.
+    """
+    return np.random.SeedSequence(root_entropy, spawn_key=(SHARD_STREAM_TAG, int(universe)))
+
+def simulate_shard(shard):
+    """
+    Simulates one universe shard; runs in a worker process.
+
+    Args:
+        shard (tuple): (qubit_inputs, mode, seed_sequence) for the shard's rows.
+
+    Returns:
+        np.ndarray: The measured state (0 or 1) of each row as uint8.
+    """
+    qubit_inputs, mode, seed_sequence = shard
+    if mode == "vectorized":
+        return simulate_vectorized(qubit_inputs, np.random.default_rng(seed_sequence))
+    simulator, templates = _get_worker_backend()
+    simulator_seed = int(seed_sequence.generate_state(1, dtype=np.uint32)[0])
+    return simulate_batched(qubit_inputs, simulator, templates, seed=simulator_seed)
+
+def _iter_shard_states(df, mode, seed, workers, skip_universes=()):
+    """
+    Simulates `df` one Universe shard at a time, in Universe order.
+
+    With several workers, at most two shards per worker are in flight, so
+    finished results are handed on without queueing the whole dataset.
+
+    Yields:
+        tuple: (universe, row_positions, quantum_states) for each shard.
+    """
+    if mode not in ("batched", "vectorized"):
+        raise ValueError(f"Unknown mode '{mode}'. Expected 'batched' or 'vectorized'.")
+
+    # Convert data to qubit inputs (0/1)
+    qubit_inputs = (df['Data'].to_numpy() > 0.5).astype(np.uint8)
+
+    # --- Shard rows by Universe ---
+    universe_codes, universes = pd.factorize(df['Universe'], sort=True)
+    row_order = np.argsort(universe_codes, kind="stable")
+    shard_rows = np.split(row_order, np.cumsum(np.bincount(universe_codes, minlength=len(universes)))[:-1])
+    root_entropy = np.random.SeedSequence(seed).entropy
+    skip_universes = {int(u) for u in skip_universes}
+    pending = [(universe, rows) for universe, rows in zip(universes, shard_rows) if int(universe) not in skip_universes]
+    # ------------------------------
+
+    def make_shard(universe, rows):
+        return (qubit_inputs[rows], mode, shard_seed_sequence(root_entropy, universe))
+
+    if workers > 1 and len(pending) > 1:
+        # Spawn rather than fork: forking after Aer has started its OpenMP
+        # threads can deadlock the children.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            in_flight = deque()
+            for universe, rows in pending:
+                in_flight.append((universe, rows, executor.submit(simulate_shard, make_shard(universe, rows))))
+                if len(in_flight) >= 2 * workers:
+                    universe, rows, future = in_flight.popleft()
+                    yield universe, rows, future.result()
+            while in_flight:
+                universe, rows, future = in_flight.popleft()
+                yield universe, rows, future.result()
+    else:
+        for universe, rows in pending:
+            yield universe, rows, simulate_shard(make_shard(universe, rows))
+
+def iter_shard_results(df, mode="batched", seed=None, workers=1, skip_universes=()):
+    """
+    Runs the quantum analysis shard by shard, yielding each Universe's
+    results as soon as they are ready so they can be written incrementally.
+
+    Args:
+        df (pd.DataFrame): Multiverse data with ['Universe', 'Reality', 'Data'].
+        mode (str): "batched" or "vectorized"; see analyze_multiverse().
+        seed (int, optional): Root seed; see analyze_multiverse().
+        workers (int): Number of worker processes; 1 runs in-process.
+        skip_universes (iterable): Universes whose shards are already done.
+
+    Yields:
+        tuple: (universe, pd.DataFrame) with columns
+               ['Universe', 'Reality', 'Quantum_State'] for that shard.
+    """
+    for universe, rows, quantum_states in _iter_shard_states(df, mode, seed, workers, skip_universes):
+        yield universe, _shard_frame(df, rows, quantum_states)
+
+def _shard_frame(df, rows, quantum_states):
+    """Builds the results DataFrame of one shard."""
+    return pd.DataFrame({
+        'Universe': df['Universe'].to_numpy()[rows],
+        'Reality': df['Reality'].to_numpy()[rows],
+        'Quantum_State': quantum_states,
+    })
+
+def analyze_multiverse(df, mode="batched", seed=None, workers=1):
+    """
+    Runs the quantum analysis for every row of the multiverse DataFrame.
+
+    Rows are sharded by 'Universe' and every shard is simulated with its own
+    seed stream, optionally across a pool of worker processes.
+
+    Args:
+        df (pd.DataFrame): Multiverse data with ['Universe', 'Reality', 'Data'].
+        mode (str): "batched" runs every row on Aer in one job per shard;
+                    "vectorized" draws every row from the templates' exact distributions.
+        seed (int, optional): Root seed; results are reproducible for a given
+                              seed regardless of `workers`.
+        workers (int): Number of worker processes; 1 runs in-process.
+
+    Returns:
+        pd.DataFrame: Columns ['Universe', 'Reality', 'Quantum_State'], in the
+                      row order of `df`.
+    """
+    # Merge the shards back into the original row order
+    quantum_states = np.empty(len(df), dtype=np.uint8)
+    for _, rows, states in _iter_shard_states(df, mode, seed, workers):
+        quantum_states[rows] = states
+
+    return pd.DataFrame({
+        'Universe': df['Universe'].to_numpy(),
+        'Reality': df['Reality'].to_numpy(),
+        'Quantum_State': quantum_states,
+    })
+
+def derive_run_seeds(seed):
+    """
+    Splits a run's root seed into independent data, simulation and
+    validation seeds, so no two of them replay the same random stream.
+
+    Args:
+        seed (int, optional): Root seed; None leaves every seed unset.
+
+    Returns:
+        tuple: (data_seed, simulation_seed, validation_seed), ints or None.
+    """
+    if seed is None:
+        return None, None, None
+    return tuple(int(child.generate_state(1, dtype=np.uint32)[0])
+                 for child in np.random.SeedSequence(seed).spawn(3))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a quantum measurement for every multiverse data point.")
+    parser.add_argument("--output", default=None,
+                        help="Results path (default: multiverse_quantum_results.csv, or .parquet for --format parquet).")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv",
+                        help="'csv' appends to one file; 'parquet' writes one part file per Universe into a directory.")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore any checkpoint and start from scratch.")
+    parser.add_argument("--store", metavar="PATH", help="Memory-map multiverse data from this store instead of generating it.")
+    parser.add_argument("--mode", choices=("batched", "vectorized"), default="batched",
+                        help="'batched' simulates every row on Aer; 'vectorized' draws rows from the known distribution.")
+    parser.add_argument("--seed", type=int, default=None, help="Root seed; independent data, simulation and validation seeds are derived from it.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes; each simulates whole Universe shards.")
+    parser.add_argument("--validate", type=int, default=0, metavar="ROWS",
+                        help="Re-simulate about this many random rows on Aer and compare (vectorized mode).")
+    args = parser.parse_args()
+    output = args.output or f"multiverse_quantum_results.{args.format}"
+    data_seed, simulation_seed, validation_seed = derive_run_seeds(args.seed)
+
+    if args.store:
+        print(f"Opening multiverse store {args.store}...")
+        df = load_multiverse_store(args.store, compact=True)
+        print(f"Mapped {len(df)} data points.")
+    else:
+        # Generate multiverse data instead of loading from CSV
+        print("Generating multiverse data...")
+        df = ingest_multiverse_data(seed=data_seed) # Use default parameters or specify as needed
+        print(f"Generated {len(df)} data points.")
+
+    resume = not args.no_resume
+    if resume and args.store is None and args.seed is None:
+        # Unseeded data differs on every run, so earlier shards cannot be reused
+        print("No --seed or --store given: generated data is not reproducible, starting from scratch.")
+        resume = False
+    # The input's fingerprint ties the checkpoint to the exact data it was computed from
+    writer = MultiverseResultsWriter(output, file_format=args.format, resume=resume,
+                                     run_params={"mode": args.mode, "seed": args.seed, "rows": len(df),
+                                                 "store": args.store, "shard_stream_tag": SHARD_STREAM_TAG,
+                                                 "input": fingerprint_frame(df, columns=['Universe', 'Reality', 'Data'])})
+    if writer.completed:
+        print(f"Resuming: skipping {len(writer.completed)} finished Universe shard(s) recorded in {writer.checkpoint_path}")
+
+    # Rows kept aside for --validate, sampled at the same rate from every shard
+    validation_rng = np.random.default_rng(validation_seed)
+    validation_rate = min(1.0, args.validate / max(len(df), 1))
+    validation_inputs, validation_states = [], []
+
+    print("\nStarting quantum simulations...")
+    start = time.perf_counter()
+    simulated_rows = 0
+    try:
+        for universe, rows, quantum_states in _iter_shard_states(df, args.mode, simulation_seed, args.workers,
+                                                                 skip_universes=writer.completed):
+            writer.write_shard(universe, _shard_frame(df, rows, quantum_states))
+            simulated_rows += len(rows)
+            if validation_rate:
+                sampled = validation_rng.random(len(rows)) < validation_rate
+                validation_inputs.append((df['Data'].to_numpy()[rows[sampled]] > 0.5).astype(np.uint8))
+                validation_states.append(quantum_states[sampled])
+    except Exception as e:
+        print(f"Error during quantum simulation: {e}")
+        print(f"Finished shards are checkpointed in {writer.checkpoint_path}; rerun to resume.")
+        raise
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {simulated_rows} rows in {elapsed:.2f}s ({simulated_rows / max(elapsed, 1e-9):,.0f} rows/s).")
+
+    if validation_inputs:
+        sample_inputs = np.concatenate(validation_inputs)
+        passed, report = validate_against_aer(sample_inputs, np.concatenate(validation_states),
+                                              len(sample_inputs), validation_rng, seed=validation_seed)
+        for row in report:
+            print(f"  data={row['data']}: rows={row['rows']} expected P(1)={row['expected']:.4f} "
+                  f"aer={row['aer']:.4f} (z={row['aer_z']:+.2f}) vectorized={row['vectorized']:.4f} (z={row['vectorized_z']:+.2f})")
+        print("Validation against Aer passed." if passed else "Validation against Aer FAILED.")
+
+    print(f"Quantum analysis complete. Results saved to {output}")
@@ -0,0 +1,160 @@
+"""
+Incremental, resumable writer for multiverse quantum analysis results.
+
+Results are written one shard (Universe) at a time, so memory use does not
+grow with the number of rows. After every shard a JSON checkpoint records
+which shards are finished, so a rerun after a crash skips them.
+"""
+import json
+import os
+import warnings
+
+import pandas as pd
+
+from atomic_write import atomic_write
+
+# Part files, and the hidden temporary files atomic_write() leaves behind if
+# the process is killed mid-write
+_PART_PREFIXES = ("part-", ".part-")
+
+
+class MultiverseResultsWriter:
+    """
+    Writes result shards to CSV (one file, appended) or Parquet (one part file
+    per shard in a directory) and checkpoints progress after each shard.
+    """
+    def __init__(self, path, file_format="csv", resume=True, run_params=None, chunk_rows=1_000_000):
+        """
+        Opens the output, resuming from its checkpoint when possible.
+
+        Args:
+            path (str): CSV file, or directory for Parquet part files.
+            file_format (str): "csv" or "parquet".
+            resume (bool): If True, keep shards recorded in an existing
+                           checkpoint with the same `run_params`.
+            run_params (dict, optional): JSON-serializable parameters of the
+                                         run; a checkpoint from a run with
+                                         different parameters is discarded.
+            chunk_rows (int): Rows written per to_csv call.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unknown format '{file_format}'. Expected 'csv' or 'parquet'.")
+        self.path = path
+        self.file_format = file_format
+        self.run_params = run_params or {}
+        self.chunk_rows = chunk_rows
+        self.checkpoint_path = f"{path.rstrip(os.sep)}.checkpoint.json"
+        self.completed = set()
+        self._csv_bytes = 0
+
+        checkpoint = self._read_checkpoint() if resume else None
+        if checkpoint is not None and checkpoint.get("run_params") != self.run_params:
+            warnings.warn(f"Checkpoint {self.checkpoint_path} belongs to a run with different parameters; starting over.")
+            checkpoint = None
+
+        if checkpoint is None:
+            self._reset_output()
+        else:
+            self.completed = set(checkpoint["completed"])
+            self._csv_bytes = checkpoint.get("csv_bytes", 0)
+            self._discard_partial_writes()
+
+    # --- Checkpoint ---
+    def _read_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("format") != self.file_format:
+            return None
+        return checkpoint
+
+    def _write_checkpoint(self):
+        checkpoint = {
+            "format": self.file_format,
+            "run_params": self.run_params,
+            "completed": sorted(self.completed),
+            "csv_bytes": self._csv_bytes,
+        }
+        with atomic_write(self.checkpoint_path, "w") as f:
+            json.dump(checkpoint, f)
+    # ------------------
+
+    def _part_path(self, shard_id):
+        return os.path.join(self.path, f"part-{int(shard_id):08d}.parquet")
+
+    def _reset_output(self):
+        """Removes previous results so the run starts from an empty output."""
+        if self.file_format == "csv":
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            for name in os.listdir(self.path):
+                if name.startswith(_PART_PREFIXES):
+                    os.remove(os.path.join(self.path, name))
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _discard_partial_writes(self):
+        """Drops anything written after the last checkpoint (e.g. by a crash mid-shard)."""
+        if self.file_format == "csv":
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self._csv_bytes:
+                with open(self.path, "r+b") as f:
+                    f.truncate(self._csv_bytes)
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            finished = {os.path.basename(self._part_path(shard_id)) for shard_id in self.completed}
+            for name in os.listdir(self.path):
+                if name.startswith(_PART_PREFIXES) and name not in finished:
+                    os.remove(os.path.join(self.path, name))
+
+    def is_complete(self, shard_id):
+        """Checks whether a shard was already written by this or a previous run."""
+        return int(shard_id) in self.completed
+
+    def write_shard(self, shard_id, shard_df):
+        """
+        Writes one shard and records it in the checkpoint.
+
+        Args:
+            shard_id (int): Identifier of the shard (the Universe ID).
+            shard_df (pd.DataFrame): The shard's results.
+        """
+        shard_id = int(shard_id)
+        if shard_id in self.completed:
+            return
+
+        if self.file_format == "csv":
+            write_header = self._csv_bytes == 0
+            with open(self.path, "a", newline="") as f:
+                for start in range(0, len(shard_df), self.chunk_rows):
+                    shard_df.iloc[start:start + self.chunk_rows].to_csv(f, header=write_header, index=False)
+                    write_header = False
+                f.flush()
+                os.fsync(f.fileno())
+                self._csv_bytes = f.tell()
+        else:
+            with atomic_write(self._part_path(shard_id)) as f:
+                shard_df.to_parquet(f, index=False)
+
+        self.completed.add(shard_id)
+        self._write_checkpoint()
+
+
+def read_results(path):
+    """
+    Loads results written by MultiverseResultsWriter (or a plain CSV).
+
+    Args:
+        path (str): CSV file, Parquet file or Parquet part directory.
+
+    Returns:
+        pd.DataFrame: The results.
+    """
+    if os.path.isdir(path) or path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
@@ -3,9 +3,11 @@ from cross_reality_analytics import identify_optimal_realities
 # Import the class definition, not inside the method
 from reality_transition_gateway import RealityTransitionGateway
 class OmniversalDecisionEngine:
-    def __init__(self, cross_reality_analysis):
+    def __init__(self, cross_reality_analysis, top_k=3, tie_break="first"):
+        # cross_reality_analysis may be a scored DataFrame or an iterable of
+        # scored chunks; only the top_k rows are kept either way
         self.cross_reality_analysis = cross_reality_analysis
-        self.optimal_realities = identify_optimal_realities(cross_reality_analysis)
+        self.optimal_realities = identify_optimal_realities(cross_reality_analysis, k=top_k, tie_break=tie_break)
     def make_decision(self):
         # Select top reality based on predicted stability score
         top_reality = self.optimal_realities.iloc[0]
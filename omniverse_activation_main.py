@@ -3,38 +3,102 @@ import reality_alignment_algorithms
 import cross_reality_analytics
 import reality_transition_gateway
 import omniversal_decision_engine
-import numpy as np # Needed for probability normalization
 from OmniversePortal import QuantumOmniverseDecision # Import the quantum decision class
+from pipeline_stages import StageCache, run_stage
+from quantum_decision import load_qiskit
+from stage_profiler import StageProfiler
 
 # import quantum_entanglement_initializer # Placeholder
-def activate_omniverse():
+def activate_omniverse(store_path=None, centroid_cache_dir=None, model_cache_dir=None, stability_seed=None,
+                       stability_model="random-forest", data_seed=None, alignment_engine="kmeans",
+                       stage_cache_dir=None, profiler=None):
+    """
+    Runs the full omniverse pipeline.
+
+    Args:
+        store_path (str, optional): Multiverse store written by
+            multiverse_ingestion.write_multiverse_store(); its data is
+            memory-mapped instead of generating a fresh dataset.
+        centroid_cache_dir (str, optional): Directory of cached reality
+            cluster centroids; repeated activations on the same or barely
+            changed data skip clustering.
+        model_cache_dir (str, optional): Directory of the stability model
+            registry; an identical training run loads the stored model.
+        stability_seed (int, optional): Seed for the placeholder stability
+            target, which makes repeated analyses cacheable.
+        stability_model (str): Estimator from
+            cross_reality_analytics.STABILITY_MODELS.
+        data_seed (int, optional): Seed for generated multiverse data.
+        alignment_engine (str): Engine from
+            reality_alignment_algorithms.CLUSTERING_ENGINES.
+        stage_cache_dir (str, optional): Directory caching the outputs of
+            the ingest, align and analyze stages. Only deterministic stages
+            are cached: generated data needs data_seed, alignment a
+            deterministic engine ("ckmeans"/"histogram") without a centroid
+            cache, and analytics a stability_seed.
+        profiler (StageProfiler, optional): Records wall/CPU time and peak
+            memory of every stage (ingest, align, analyze, gateway,
+            qiskit-import, decision) for a run report.
+    """
+    stage_cache = StageCache(stage_cache_dir) if stage_cache_dir is not None else None
+    profiler = profiler if profiler is not None else StageProfiler()
+    
     # Initialize Multiverse Ingestion
-    multiverse_data = multiverse_ingestion.ingest_multiverse_data()
+    with profiler.stage("ingest") as record:
+        if store_path is not None:
+            # Already on disk and memory-mapped; keyed by its content
+            ingested = run_stage(stage_cache, "ingest",
+                                 lambda: multiverse_ingestion.load_multiverse_store(store_path, compact=True),
+                                 cacheable=False)
+        else:
+            ingested = run_stage(stage_cache, "ingest", lambda: multiverse_ingestion.ingest_multiverse_data(seed=data_seed),
+                                 params={"seed": data_seed}, cacheable=data_seed is not None)
+        multiverse_data = ingested.value
+        record.update(cached=ingested.cached, rows=len(multiverse_data))
     
     # Align Realities
-    aligned_realities = reality_alignment_algorithms.align_realities(multiverse_data)
+    with profiler.stage("align") as record:
+        centroid_cache = None
+        if centroid_cache_dir is not None:
+            centroid_cache = reality_alignment_algorithms.CentroidCache(centroid_cache_dir)
+        aligned = run_stage(stage_cache, "align",
+                            lambda: reality_alignment_algorithms.align_realities(multiverse_data, engine=alignment_engine,
+                                                                                 centroid_cache=centroid_cache),
+                            params={"engine": alignment_engine}, upstream=(ingested,),
+                            cacheable=alignment_engine != "kmeans" and centroid_cache is None)
+        aligned_realities = aligned.value
+        record.update(cached=aligned.cached, rows=len(aligned_realities))
     
     # Analyze Cross-Reality Data
-    analytics_results = cross_reality_analytics.analyze_cross_reality_data(aligned_realities)
+    with profiler.stage("analyze") as record:
+        model_registry = None
+        if model_cache_dir is not None:
+            from model_registry import ModelRegistry
+            model_registry = ModelRegistry(model_cache_dir)
+        analyzed = run_stage(stage_cache, "analyze",
+                             lambda: cross_reality_analytics.analyze_cross_reality_data(
+                                 aligned_realities, model_registry=model_registry, stability_seed=stability_seed,
+                                 model=stability_model),
+                             params={"stability_seed": stability_seed, "model": stability_model}, upstream=(aligned,),
+                             cacheable=stability_seed is not None)
+        analytics_results = analyzed.value
+        record.update(cached=analyzed.cached, rows=len(analytics_results))
     
     # Initialize Reality Transition Gateway
-    gateway = reality_transition_gateway.initialize_gateway()
+    with profiler.stage("gateway"):
+        gateway = reality_transition_gateway.initialize_gateway()
     
     # --- Option 1: Replace Classical Engine with Quantum ---
     print("\n--- Activating Quantum Decision Engine ---")
-    # Extract top N realities and their scores (e.g., top 3)
-    # Assuming analytics_results index represents reality identifiers
-    top_realities = analytics_results.nlargest(3, 'Predicted Stability')
-    outcomes = top_realities.index.tolist()
-    probabilities_raw = top_realities['Predicted Stability'].values
-
-    # Normalize probabilities (simple example: shift to non-negative and normalize)
-    probabilities_shifted = probabilities_raw - probabilities_raw.min() + 1e-9 # Add small epsilon if min is 0
-    probabilities = probabilities_shifted / probabilities_shifted.sum()
-
-    # Create and use the Quantum Decision Maker
-    quantum_decision_maker = QuantumOmniverseDecision(outcomes, probabilities.tolist())
-    chosen_reality = quantum_decision_maker.make_decision() # This also triggers the portal transition
+    # qiskit is imported lazily on first use; measure that separately from the simulation
+    with profiler.stage("qiskit-import"):
+        load_qiskit()
+    with profiler.stage("decision"):
+        # Select the top N realities (e.g., top 3) by predicted stability with a
+        # bounded heap and decide between them
+        # Assuming analytics_results index represents reality identifiers
+        quantum_decision_maker = QuantumOmniverseDecision.from_top_realities(analytics_results, k=3)
+        chosen_reality = quantum_decision_maker.make_decision() # This also triggers the portal transition
     print(f"Quantum Decision Engine selected and transitioned to: {chosen_reality}")
 
     # --- Option 2: Keep Classical Engine (comment out Option 1 if using this) ---
@@ -46,4 +110,34 @@ def activate_omniverse():
     
     print("Omniverse Activated Successfully!")
 if __name__ == "__main__":
-    activate_omniverse()
+    import argparse
+    import os
+    parser = argparse.ArgumentParser(description="Run the omniverse activation pipeline.")
+    parser.add_argument("store_path", nargs="?", help="Multiverse store to memory-map instead of generating data.")
+    parser.add_argument("--centroid-cache", help="Directory caching reality cluster centroids between runs.")
+    parser.add_argument("--model-cache", help="Directory of the stability model registry.")
+    parser.add_argument("--stability-seed", type=int, help="Seed for the placeholder stability target.")
+    parser.add_argument("--stability-model", default="random-forest", choices=sorted(cross_reality_analytics.STABILITY_MODELS),
+                        help="Estimator predicting reality stability.")
+    parser.add_argument("--data-seed", type=int, help="Seed for generated multiverse data.")
+    parser.add_argument("--alignment-engine", default="kmeans", choices=reality_alignment_algorithms.CLUSTERING_ENGINES,
+                        help="Clustering engine for reality alignment.")
+    parser.add_argument("--stage-cache", help="Directory caching deterministic stage outputs between runs.")
+    parser.add_argument("--profile-report", metavar="PATH",
+                        help="Write a JSON report of per-stage timings and memory (a directory gets one file per run).")
+    parser.add_argument("--cprofile", action="store_true", help="Add per-stage cProfile hot spots to the report.")
+    parser.add_argument("--tracemalloc", action="store_true", help="Add per-stage Python allocation peaks to the report.")
+    args = parser.parse_args()
+    profiler = StageProfiler(cprofile=args.cprofile, tracemalloc_enabled=args.tracemalloc)
+    if args.cprofile and args.profile_report:
+        # Per-stage .prof files go next to the report, in a directory named after it
+        profiler.profile_dir = f"{os.path.splitext(profiler.report_path(args.profile_report))[0]}-profiles"
+    activate_omniverse(store_path=args.store_path, centroid_cache_dir=args.centroid_cache,
+                       model_cache_dir=args.model_cache, stability_seed=args.stability_seed,
+                       stability_model=args.stability_model, data_seed=args.data_seed,
+                       alignment_engine=args.alignment_engine, stage_cache_dir=args.stage_cache,
+                       profiler=profiler)
+    if args.profile_report or args.cprofile or args.tracemalloc:
+        print(profiler.summary())
+    if args.profile_report:
+        print(f"Profile report written to {profiler.write_report(args.profile_report, params=vars(args))}")
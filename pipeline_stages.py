@@ -0,0 +1,87 @@
+"""
+Named pipeline stages with content-addressed on-disk result caching.
+
+A stage's cache key is a fingerprint of its name, its parameters and the keys
+of the stages it consumes, so changing a parameter invalidates that stage and
+everything downstream while earlier stages are loaded from disk. Stages that
+are not deterministic (e.g. unseeded random data) are always recomputed;
+their key is then a fingerprint of the output itself, so downstream stages
+still hit the cache whenever they see identical input.
+"""
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+from atomic_write import atomic_write
+from fingerprint import fingerprint_frame, fingerprint_params
+
+# Bump when a stage's implementation changes in a way that alters its output,
+# so results cached by older code are not reused
+STAGE_CACHE_VERSION = 1
+
+StageResult = namedtuple("StageResult", ["value", "key", "cached"])
+
+
+class StageCache:
+    """Directory of stage outputs (pickled DataFrames) named by stage and key."""
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Cache directory; created if missing.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name, key):
+        return os.path.join(self.directory, f"{name}-{key}.pkl")
+
+    def load(self, name, key):
+        """Returns the cached output of stage `name` under `key`, or None."""
+        path = self.path(name, key)
+        return pd.read_pickle(path) if os.path.exists(path) else None
+
+    def store(self, name, key, value):
+        """Writes a stage output."""
+        with atomic_write(self.path(name, key)) as f:
+            pd.to_pickle(value, f, compression=None)
+
+
+def run_stage(cache, name, compute, params=None, upstream=(), cacheable=True):
+    """
+    Runs one pipeline stage, loading its output from the cache when possible.
+
+    Args:
+        cache (StageCache, optional): Stage cache; None runs the stage uncached.
+        name (str): Stage name.
+        compute (callable): Called without arguments to produce the output DataFrame.
+        params (dict, optional): JSON-serializable parameters the output depends on.
+        upstream (tuple): StageResults of the stages whose outputs `compute` uses.
+        cacheable (bool): False for stages whose output is not determined by
+                          their parameters and inputs (e.g. unseeded randomness).
+
+    Returns:
+        StageResult: (value, key, cached).
+    """
+    if cache is None:
+        return StageResult(compute(), None, False)
+
+    key = fingerprint_params({
+        "version": STAGE_CACHE_VERSION,
+        "stage": name,
+        "params": params or {},
+        "upstream": [result.key for result in upstream],
+    })
+    if cacheable:
+        value = cache.load(name, key)
+        if value is not None:
+            print(f"Stage '{name}': loaded from cache.")
+            return StageResult(value, key, True)
+
+    value = compute()
+    if cacheable:
+        cache.store(name, key, value)
+    else:
+        # Content-address the output so identical results still match downstream
+        key = fingerprint_params({"stage": name, "content": fingerprint_frame(value)})
+    return StageResult(value, key, False)
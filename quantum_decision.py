@@ -1,15 +1,210 @@
-import numpy as np
-from qiskit import QuantumCircuit, transpile
-# Ensure you have qiskit-aer installed: pip install qiskit-aer
-try:
-    from qiskit_aer import AerSimulator
-except ImportError:
-    print("Warning: qiskit-aer not found. Please install using 'pip install qiskit-aer'")
-    # Fallback or raise error if AerSimulator is critical
-    AerSimulator = None # Or define a dummy simulator if needed for basic checks
+"""
+Quantum decision engine: samples decisions from a classical probability
+distribution encoded into the amplitudes of a quantum state.
 
+qiskit and qiskit-aer are imported lazily, the first time a quantum backend
+builds or simulates a circuit, so importing this module (or OmniversePortal)
+stays cheap for callers that only need the "analytic" backend.
+"""
+import importlib.util
 import math
+import threading
 import warnings
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import numpy as np
+
+# Supported ways of turning the encoded state into outcome probabilities:
+#   "aer"         - measure the amplitude-encoded circuit on the Aer simulator.
+#   "statevector" - read the exact probabilities off the encoded statevector.
+#   "analytic"    - skip the circuit and draw shot counts from a multinomial over
+#                   the stored probabilities (same distribution as "aer").
+BACKENDS = ("aer", "statevector", "analytic")
+
+# --- Lazy Qiskit Import ---
+_qiskit = None
+
+
+def load_qiskit():
+    """
+    Imports qiskit (and qiskit-aer when installed) on first use.
+
+    Returns:
+        SimpleNamespace: QuantumCircuit, transpile, Statevector and AerSimulator
+                         (None if qiskit-aer is not installed).
+    """
+    global _qiskit
+    if _qiskit is None:
+        from qiskit import QuantumCircuit, transpile
+        from qiskit.quantum_info import Statevector
+        # Ensure you have qiskit-aer installed: pip install qiskit-aer
+        try:
+            from qiskit_aer import AerSimulator
+        except ImportError:
+            AerSimulator = None
+        _qiskit = SimpleNamespace(QuantumCircuit=QuantumCircuit, transpile=transpile,
+                                  Statevector=Statevector, AerSimulator=AerSimulator)
+    return _qiskit
+
+
+def aer_available():
+    """Checks whether qiskit-aer is installed without importing it."""
+    return importlib.util.find_spec("qiskit_aer") is not None
+# --------------------------
+
+
+# --- Compiled Circuit Cache ---
+# Amplitude-encoding circuits depend only on the probability vector and the
+# qubit count, so the transpiled circuit can be shared by every decision maker
+# (and every call) that uses the same distribution.
+CIRCUIT_CACHE_MAXSIZE = 128
+# Probabilities are rounded to this many decimals before being used as a cache
+# key, so float noise from normalization does not defeat the cache.
+CIRCUIT_CACHE_DECIMALS = 12
+
+_circuit_cache = OrderedDict()
+_circuit_cache_lock = threading.Lock()
+_circuit_cache_stats = {"hits": 0, "misses": 0}
+_shared_simulator = None
+
+
+def get_shared_simulator():
+    """Returns the process-wide AerSimulator, creating it on first use."""
+    global _shared_simulator
+    if _shared_simulator is None:
+        AerSimulator = load_qiskit().AerSimulator
+        if AerSimulator is None:
+            raise RuntimeError("qiskit-aer is required but not installed. Please run 'pip install qiskit-aer'")
+        _shared_simulator = AerSimulator()
+    return _shared_simulator
+
+
+def circuit_cache_info():
+    """
+    Reports the state of the compiled circuit cache.
+
+    Returns:
+        dict: 'hits', 'misses', 'size' and 'maxsize' of the cache.
+    """
+    with _circuit_cache_lock:
+        return {**_circuit_cache_stats, "size": len(_circuit_cache), "maxsize": CIRCUIT_CACHE_MAXSIZE}
+
+
+def clear_circuit_cache():
+    """Drops every cached circuit and resets the hit/miss counters."""
+    with _circuit_cache_lock:
+        _circuit_cache.clear()
+        _circuit_cache_stats["hits"] = 0
+        _circuit_cache_stats["misses"] = 0
+
+
+def _circuit_cache_key(probabilities, num_qubits):
+    """Builds the cache key from the quantized probability vector and qubit count."""
+    quantized = np.round(np.asarray(probabilities, dtype=float), CIRCUIT_CACHE_DECIMALS)
+    return (num_qubits, quantized.tobytes())
+
+
+def _get_compiled_circuit(key, build_circuit):
+    """
+    Returns the transpiled circuit for `key`, building it with `build_circuit`
+    and transpiling it for the shared simulator on a cache miss.
+    """
+    with _circuit_cache_lock:
+        compiled_circuit = _circuit_cache.get(key)
+        if compiled_circuit is not None:
+            _circuit_cache.move_to_end(key)
+            _circuit_cache_stats["hits"] += 1
+            return compiled_circuit
+        _circuit_cache_stats["misses"] += 1
+
+    # Build and transpile outside the lock; a concurrent miss on the same key
+    # only costs a duplicate transpile.
+    compiled_circuit = load_qiskit().transpile(build_circuit(), get_shared_simulator())
+
+    with _circuit_cache_lock:
+        _circuit_cache[key] = compiled_circuit
+        _circuit_cache.move_to_end(key)
+        while len(_circuit_cache) > CIRCUIT_CACHE_MAXSIZE:
+            _circuit_cache.popitem(last=False)
+    return compiled_circuit
+# ------------------------------
+
+def _bitstrings_to_indices(bitstrings, num_qubits):
+    """
+    Converts Qiskit measurement bitstrings (qubit 0 rightmost) to integer
+    basis-state indices without a per-shot Python loop.
+
+    Args:
+        bitstrings (np.ndarray): Unicode array of equal-length bitstrings.
+        num_qubits (int): Length of each bitstring.
+
+    Returns:
+        np.ndarray: The basis-state index of each bitstring.
+    """
+    if num_qubits == 0:
+        return np.zeros(len(bitstrings), dtype=np.int64)
+    # Each unicode character is a 4-byte code point, so '0'/'1' become 48/49.
+    bits = bitstrings.astype(f"U{num_qubits}").view(np.uint32).reshape(-1, num_qubits) - ord("0")
+    place_values = 1 << np.arange(num_qubits - 1, -1, -1, dtype=np.int64)
+    return bits.astype(np.int64) @ place_values
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table for constant-time sampling from a fixed discrete
+    distribution. Building the table is O(n); every draw afterwards is O(1).
+    """
+    def __init__(self, weights):
+        """
+        Builds the alias table.
+
+        Args:
+            weights (array-like): Non-negative weights; normalized internally.
+
+        Raises:
+            ValueError: If the weights are empty or do not have a positive sum.
+        """
+        weights = np.asarray(weights, dtype=float)
+        total = weights.sum()
+        if weights.size == 0 or total <= 0:
+            raise ValueError("Alias table weights must be non-empty with a positive sum.")
+
+        n = weights.size
+        scaled = weights * (n / total)
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+
+        small = np.flatnonzero(scaled < 1.0).tolist()
+        large = np.flatnonzero(scaled >= 1.0).tolist()
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding error, so keeps prob 1 / alias to itself
+
+    def __len__(self):
+        return self.prob.size
+
+    def sample(self, rng, size=None):
+        """
+        Draws outcome indices from the table.
+
+        Args:
+            rng (np.random.Generator): Source of randomness.
+            size (int, optional): Number of draws; None returns a single int.
+
+        Returns:
+            int or np.ndarray: The drawn index or indices.
+        """
+        column = rng.integers(self.prob.size, size=size)
+        keep = rng.random(size) < self.prob[column]
+        if size is None:
+            return int(column if keep else self.alias[column])
+        return np.where(keep, column, self.alias[column])
+
 
 class QuantumDecision:
     """
@@ -19,7 +214,7 @@ class QuantumDecision:
     This implementation uses amplitude encoding to represent the probability
     distribution in a quantum state and simulates its measurement.
     """
-    def __init__(self, outcomes, probabilities):
+    def __init__(self, outcomes, probabilities, backend="aer", seed=None):
         """
         Initializes the Quantum Decision Maker.
 
@@ -29,13 +224,22 @@ class QuantumDecision:
             probabilities (list): A list of classical probabilities corresponding
                                   to each outcome. Must sum to approximately 1.0.
                                   Must have the same length as outcomes.
+            backend (str): How outcome probabilities are produced; one of
+                           "aer" (default), "statevector" or "analytic".
+            seed (int, optional): Seed for the random generator used for
+                                  analytic shot draws, outcome sampling and
+                                  the Aer simulator's per-run seeds.
 
         Raises:
             ValueError: If probabilities do not sum to 1, if list lengths
-                        mismatch, or if the outcomes list is empty.
-            RuntimeError: If qiskit-aer is not installed and simulation is attempted.
+                        mismatch, if the outcomes list is empty, or if the
+                        backend is unknown.
+            RuntimeError: If the "aer" backend is selected and qiskit-aer is
+                          not installed.
         """
-        if AerSimulator is None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Expected one of {BACKENDS}.")
+        if backend == "aer" and not aer_available():
              raise RuntimeError("qiskit-aer is required but not installed. Please run 'pip install qiskit-aer'")
 
         if not math.isclose(sum(probabilities), 1.0, abs_tol=1e-9):
@@ -59,22 +263,27 @@ class QuantumDecision:
         # Determine number of qubits needed to represent outcomes
         # We need 2^n >= num_outcomes
         self.num_qubits = math.ceil(math.log2(self.num_outcomes)) if self.num_outcomes > 0 else 0
+        self._circuit_key = _circuit_cache_key(self.probabilities, self.num_qubits)
 
-    def _calculate_probabilities(self, shots=4096):
+        self.backend = backend
+        self._rng = np.random.default_rng(seed)
+        self._exact_probabilities = None # Filled lazily by the statevector backend
+        self._alias_table = None # Filled lazily for the statevector/analytic backends
+
+        # Object array so that labels[indices] maps decision indices to outcomes
+        self.labels = np.empty(self.num_outcomes, dtype=object)
+        self.labels[:] = outcomes
+
+    def _build_circuit(self, measure=True):
         """
-        Calculates the probabilities of each outcome using a quantum circuit simulation.
-        This implementation uses amplitude encoding based on the input classical probabilities.
+        Builds the amplitude-encoding circuit for the stored probabilities.
 
         Args:
-            shots (int): The number of simulated measurements to perform. Higher
-                         numbers give results closer to theoretical probabilities.
+            measure (bool): If True (default), measures all qubits at the end.
 
         Returns:
-            dict: A dictionary mapping each outcome to its simulated probability.
+            QuantumCircuit: The un-transpiled circuit.
         """
-        if self.num_outcomes == 0:
-            return {}
-
         # Calculate the amplitudes (sqrt of probabilities)
         amplitudes = np.sqrt(self.probabilities)
 
@@ -85,58 +294,242 @@ class QuantumDecision:
         initial_state = np.zeros(target_dim, dtype=complex)
         initial_state[:self.num_outcomes] = amplitudes
 
-        # --- Quantum Circuit Construction ---
-        qc = QuantumCircuit(self.num_qubits, name="decision_qc")
+        qc = load_qiskit().QuantumCircuit(self.num_qubits, name="decision_qc")
         qc.initialize(initial_state, range(self.num_qubits))
-        qc.measure_all()
-        # ------------------------------------
+        if measure:
+            qc.measure_all()
+        return qc
+
+    def _statevector_probabilities(self):
+        """
+        Computes the exact outcome probabilities of the encoded state.
+
+        Returns:
+            np.ndarray: Probability of each outcome, in the order of `outcomes`.
+        """
+        if self._exact_probabilities is None:
+            Statevector = load_qiskit().Statevector
+            state_probabilities = Statevector(self._build_circuit(measure=False)).probabilities()
+            exact = state_probabilities[:self.num_outcomes]
+            self._exact_probabilities = exact / exact.sum()
+        return self._exact_probabilities
+
+    def _simulator_seed(self):
+        """Draws the Aer seed of one run, so seeded decision makers are reproducible."""
+        return int(self._rng.integers(2**31))
+
+    def _get_alias_table(self):
+        """
+        Returns the alias table for the fixed distribution of the "statevector"
+        and "analytic" backends, building it on first use.
+        """
+        if self._alias_table is None:
+            probabilities = self._statevector_probabilities() if self.backend == "statevector" else self.probabilities
+            self._alias_table = AliasTable(probabilities)
+        return self._alias_table
+
+    def probability_vector(self, shots=4096):
+        """
+        Calculates the probability of each outcome using the configured backend.
+        The quantum backends use amplitude encoding based on the input classical probabilities.
+
+        Args:
+            shots (int): The number of simulated measurements to perform. Higher
+                         numbers give results closer to theoretical probabilities.
+                         Ignored by the "statevector" backend.
+
+        Returns:
+            np.ndarray: Dense probability vector in the order of `outcomes`.
+        """
+        if self.num_outcomes == 0:
+            return np.empty(0)
+
+        if self.backend == "statevector":
+            return self._statevector_probabilities().copy()
+
+        if self.backend == "analytic":
+            # Measuring the encoded state is a multinomial draw over the stored
+            # probabilities, so the circuit can be skipped entirely.
+            return self._rng.multinomial(shots, self.probabilities) / shots
+
+        # --- Compiled Circuit (cached per distribution) ---
+        compiled_circuit = _get_compiled_circuit(self._circuit_key, self._build_circuit)
+        # -----------------
 
         # --- Simulation ---
-        simulator = AerSimulator()
-        compiled_circuit = transpile(qc, simulator)
-        result = simulator.run(compiled_circuit, shots=shots).result()
+        simulator = get_shared_simulator()
+        result = simulator.run(compiled_circuit, shots=shots, seed_simulator=self._simulator_seed()).result()
         counts = result.get_counts(compiled_circuit)
         # -----------------
 
         # --- Process Results ---
-        calculated_probabilities = {}
-        total_valid_shots = 0 # Count shots corresponding to defined outcomes
-
-        for i, outcome in enumerate(self.outcomes):
-            binary_index = format(i, f'0{self.num_qubits}b')
-            qiskit_key = binary_index[::-1] # Reverse for Qiskit's typical ordering
-            count = counts.get(qiskit_key, 0)
-            calculated_probabilities[outcome] = count
-            total_valid_shots += count
+        # Decode only the observed keys, then scatter their counts into a dense
+        # vector indexed by basis state; basis state i is outcome i.
+        state_indices = _bitstrings_to_indices(np.asarray(list(counts)), self.num_qubits)
+        state_counts = np.fromiter(counts.values(), dtype=float, count=len(counts))
+        outcome_counts = np.bincount(state_indices, weights=state_counts,
+                                     minlength=2**self.num_qubits)[:self.num_outcomes]
 
+        total_valid_shots = outcome_counts.sum() # Shots corresponding to defined outcomes
         if total_valid_shots > 0:
-             for outcome in calculated_probabilities:
-                 calculated_probabilities[outcome] /= total_valid_shots
+            outcome_counts /= total_valid_shots
         # ---------------------
 
-        return calculated_probabilities
+        return outcome_counts
+
+    def _calculate_probabilities(self, shots=4096):
+        """
+        Calculates the probabilities of each outcome using the configured backend.
+
+        Args:
+            shots (int): The number of simulated measurements to perform.
+
+        Returns:
+            dict: A dictionary mapping each outcome to its simulated probability.
+        """
+        if self.num_outcomes == 0:
+            return {}
+        return dict(zip(self.outcomes, self.probability_vector(shots=shots).tolist()))
 
     def make_decision(self, sample=True, shots=4096):
         """
         Makes a decision based on the calculated quantum probabilities.
+
+        Args:
+            sample (bool): If True (default), samples one outcome based on the
+                           simulated probabilities.
+                           If False, returns the full dictionary of outcomes
+                           and their simulated probabilities.
+            shots (int): Number of shots for the simulation used to determine
+                         the probability distribution for sampling or returning.
+
+        Returns:
+            - If sample is True: The chosen outcome (type depends on input outcomes).
+            - If sample is False: A dictionary mapping each outcome to its
+                                  simulated probability.
         """
-        quantum_probabilities_dict = self._calculate_probabilities(shots=shots)
+        if self.num_outcomes == 0:
+            return None if sample else {}
+
+        if not sample:
+            return self._calculate_probabilities(shots=shots)
 
-        if not quantum_probabilities_dict:
-             return None if sample else {}
+        if self.backend != "aer":
+            # A draw from a multinomial estimate (or the exact distribution) is
+            # distributed like the stored probabilities, so sample them directly.
+            return self.labels[self._get_alias_table().sample(self._rng)]
 
-        if sample:
-            outcome_list = list(quantum_probabilities_dict.keys())
-            prob_list = np.array(list(quantum_probabilities_dict.values()))
-            prob_list /= prob_list.sum() # Ensure normalization for np.random.choice
-            chosen_outcome = np.random.choice(outcome_list, p=prob_list)
-            return chosen_outcome
+        weights = self.probability_vector(shots=shots)
+        if weights.sum() <= 0:
+            return self.labels[0]
+        # The estimate is used for a single draw, so an O(n) inverse-CDF lookup
+        # beats building an alias table for it.
+        cumulative = np.cumsum(weights)
+        index = np.searchsorted(cumulative, self._rng.random() * cumulative[-1], side="right")
+        return self.labels[min(index, self.num_outcomes - 1)]
+
+    def make_decisions(self, n):
+        """
+        Makes `n` independent decisions from a single simulation.
+
+        The "aer" backend runs the circuit once with `n` shots and reads one
+        decision per shot from the shot memory; the other backends take a single
+        draw of size `n` from their outcome distribution.
+
+        Args:
+            n (int): Number of decisions to make.
+
+        Returns:
+            tuple: (indices, labels) where `indices` is an int64 array of
+                   outcome positions and `labels` is an object array such that
+                   `labels[indices]` gives the chosen outcomes.
+        """
+        if n <= 0 or self.num_outcomes == 0:
+            return np.empty(0, dtype=np.int64), self.labels
+
+        if self.backend == "aer":
+            compiled_circuit = _get_compiled_circuit(self._circuit_key, self._build_circuit)
+            result = get_shared_simulator().run(compiled_circuit, shots=n, memory=True,
+                                                seed_simulator=self._simulator_seed()).result()
+            memory = np.asarray(result.get_memory(compiled_circuit))
+            indices = _bitstrings_to_indices(memory, self.num_qubits)
         else:
-            return quantum_probabilities_dict
+            indices = self._get_alias_table().sample(self._rng, size=n)
+
+        return indices.astype(np.int64, copy=False), self.labels
+
+    def iter_decisions(self, n=None, batch_size=1024):
+        """
+        Yields decisions one at a time, simulating them `batch_size` at a time.
+
+        Args:
+            n (int, optional): Total number of decisions; None yields forever.
+            batch_size (int): Decisions drawn per simulation.
+
+        Yields:
+            The chosen outcome for each decision.
+        """
+        remaining = n
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            indices, labels = self.make_decisions(size)
+            yield from labels[indices]
+            if remaining is not None:
+                remaining -= size
 
     def __str__(self):
         """Provides a string representation of the QuantumDecision object."""
         return (f"QuantumDecision(num_outcomes={self.num_outcomes}, "
                 f"num_qubits={self.num_qubits}, "
+                f"backend={self.backend}, "
                 f"outcomes={self.outcomes}, "
-                f"probabilities={self.probabilities.tolist()})")
\ No newline at end of file
+                f"probabilities={self.probabilities.tolist()})")
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    possible_outcomes = ["Action A", "Action B", "Action C", "Action D"]
+    classical_probs = [0.1, 0.4, 0.3, 0.2] # Must sum to 1.0
+
+    try:
+        decision_maker = QuantumDecision(possible_outcomes, classical_probs)
+        print("Initialized Decision Maker:")
+        print(decision_maker)
+        print("-" * 30)
+
+        # Get the simulated probability distribution
+        print("Simulated Probabilities (from Qiskit):")
+        simulated_probs = decision_maker.make_decision(sample=False, shots=8192)
+        for outcome, prob in simulated_probs.items():
+            print(f"  - {outcome}: {prob:.4f}")
+        print("-" * 30)
+
+        # One simulation provides the whole decision stream
+        print("Making 10 sampled decisions:")
+        indices, labels = decision_maker.make_decisions(10)
+        for i, chosen in enumerate(labels[indices]):
+            print(f"  Decision {i+1}: {chosen}")
+        print("-" * 30)
+
+        # Example with outcomes not a power of 2
+        outcomes_3 = ["Stay", "Switch", "Fold"]
+        probs_3 = [0.5, 0.3, 0.2]
+        decision_maker_3 = QuantumDecision(outcomes_3, probs_3)
+        print("\nInitialized Decision Maker (3 outcomes):")
+        print(decision_maker_3)
+        sim_probs_3 = decision_maker_3.make_decision(sample=False, shots=8192)
+        print("Simulated Probabilities (3 outcomes):")
+        for outcome, prob in sim_probs_3.items():
+            print(f"  - {outcome}: {prob:.4f}")
+        chosen_3 = decision_maker_3.make_decision(sample=True)
+        print(f"Sampled Decision (3 outcomes): {chosen_3}")
+
+        # The analytic backend never imports qiskit
+        analytic_maker = QuantumDecision(outcomes_3, probs_3, backend="analytic")
+        print(f"Sampled Decision (analytic backend): {analytic_maker.make_decision()}")
+
+
+    except ValueError as e:
+        print(f"Error initializing QuantumDecision: {e}")
+    except ImportError:
+        print("Error: Qiskit or Qiskit Aer might not be installed.")
+        print("Please install using: pip install qiskit qiskit-aer numpy")
@@ -1,18 +1,154 @@
+import numpy as np
 import pandas as pd
 from scipy.spatial import distance
-from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import cosine_similarity # Import for pairwise similarity
+from sklearn.cluster import KMeans, MiniBatchKMeans
+import json
+import os
 import warnings # To handle potential SettingWithCopyWarning
-def align_realities(multiverse_df):
+from atomic_write import atomic_write
+from clustering_1d import assign_to_centers, ckmeans_1d, histogram_kmeans_1d
+from fingerprint import fingerprint_array, fingerprint_params
+from reality_similarity import BlockedCosineSimilarity, SignSimilarity
+
+# "kmeans" is scikit-learn's randomized Lloyd iteration; "ckmeans" is the exact
+# 1-D optimum; "histogram" clusters a histogram of the data in linear time.
+CLUSTERING_ENGINES = ("kmeans", "ckmeans", "histogram")
+
+# --- Centroid cache ---
+# Quantiles of the normalized data stored with fitted centroids; their largest
+# shift between two datasets is the drift that decides whether to refit.
+DRIFT_QUANTILES = np.linspace(0.0, 1.0, 21)
+
+class CentroidCache:
+    """
+    Directory of fitted centroids keyed by dataset fingerprint, plus the most
+    recent fit per (engine, n_clusters) for warm starts on new datasets.
+    """
+    def __init__(self, directory, max_entries=256):
+        """
+        Args:
+            directory (str): Cache directory; created if missing.
+            max_entries (int): Fingerprint entries kept; the oldest are removed.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _read(self, name):
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _write(self, name, entry):
+        with atomic_write(os.path.join(self.directory, name), "w") as f:
+            json.dump(entry, f)
+
+    @staticmethod
+    def _latest_name(engine, n_clusters):
+        return f"latest-{engine}-{n_clusters}.json"
+
+    def get(self, key):
+        """Returns the entry stored under `key`, or None."""
+        return self._read(f"{key}.json")
+
+    def latest(self, engine, n_clusters):
+        """Returns the most recently stored entry for this engine and cluster count, or None."""
+        return self._read(self._latest_name(engine, n_clusters))
+
+    def put(self, key, entry):
+        """Stores `entry` under `key` and as the latest for its engine and cluster count."""
+        self._write(f"{key}.json", entry)
+        self._write(self._latest_name(entry["engine"], entry["n_clusters"]), entry)
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if name.endswith(".json") and not name.startswith("latest-")]
+        for path in sorted(entries, key=os.path.getmtime)[:-self.max_entries]:
+            os.remove(path)
+
+def quantile_drift(reference_quantiles, quantiles):
+    """Largest absolute shift between two DRIFT_QUANTILES profiles of normalized data."""
+    return float(np.max(np.abs(np.asarray(reference_quantiles) - np.asarray(quantiles))))
+
+def _fit_centers(values, n_clusters, engine, init=None):
+    """Fits `engine` to normalized 1-D values and returns its centers in ascending order."""
+    if engine == "ckmeans":
+        return ckmeans_1d(values, n_clusters)[1]
+    if engine == "histogram":
+        return histogram_kmeans_1d(values, n_clusters)[1]
+    if init is not None:
+        kmeans = KMeans(n_clusters=n_clusters, init=np.reshape(init, (-1, 1)), n_init=1)
+    else:
+        kmeans = KMeans(n_clusters=n_clusters, n_init='auto')
+    return np.sort(kmeans.fit(values.reshape(-1, 1)).cluster_centers_[:, 0])
+
+def _cached_cluster_labels(raw_values, values, n_clusters, engine, centroid_cache, drift_threshold):
+    """
+    Labels normalized `values` using cached centroids where possible.
+
+    An exact fingerprint match reuses its centroids. Otherwise the latest fit
+    is reused if the data drifted at most `drift_threshold`; beyond that the
+    engine refits, warm-started from the latest centroids for KMeans.
+    """
+    key = fingerprint_params({"data": fingerprint_array(raw_values), "engine": engine, "n_clusters": n_clusters})
+    entry = centroid_cache.get(key)
+    if entry is not None:
+        print("Centroid cache hit; skipping clustering.")
+    else:
+        quantiles = np.quantile(values, DRIFT_QUANTILES)
+        previous = centroid_cache.latest(engine, n_clusters)
+        drift = None if previous is None else quantile_drift(previous["quantiles"], quantiles)
+        if drift is not None and drift <= drift_threshold:
+            print(f"Data drift {drift:.4f} <= {drift_threshold}; reusing cached centroids.")
+            # Keep the reference quantiles of the fit, so slow drift still adds up to a refit
+            entry = previous
+        else:
+            if drift is not None:
+                print(f"Data drift {drift:.4f} > {drift_threshold}; refitting centroids.")
+            init = previous["centers"] if previous is not None and engine == "kmeans" else None
+            entry = {
+                "engine": engine,
+                "n_clusters": n_clusters,
+                "centers": _fit_centers(values, n_clusters, engine, init=init).tolist(),
+                "quantiles": quantiles.tolist(),
+            }
+        centroid_cache.put(key, entry)
+    return assign_to_centers(values, entry["centers"])
+# ----------------------
+
+def align_realities(multiverse_df, n_clusters=5, engine="kmeans", centroid_cache=None, drift_threshold=0.02):
+    """
+    Clusters the multiverse data points and averages each Universe's data per
+    cluster.
+
+    Args:
+        multiverse_df (pd.DataFrame): Data with 'Universe', 'Reality' and 'Data' columns.
+        n_clusters (int): Number of reality clusters.
+        engine (str): One of CLUSTERING_ENGINES. "ckmeans" and "histogram"
+                      give deterministic labels ordered by cluster center.
+        centroid_cache (CentroidCache, optional): Reuses centroids fitted on
+                      the same or a barely changed dataset and stores new
+                      fits. Labels are then nearest-centroid assignments,
+                      ordered by cluster center.
+        drift_threshold (float): Largest quantile shift of the normalized
+                      data (see quantile_drift) at which the latest cached
+                      centroids are reused instead of refitting.
+
+    Returns:
+        pd.DataFrame: Mean 'Data' per ('Universe', 'Reality Cluster').
+
+    Raises:
+        ValueError: If the engine is unknown.
+    """
+    if engine not in CLUSTERING_ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Expected one of {CLUSTERING_ENGINES}.")
+
     # Select relevant columns for reality alignment
     alignment_df = multiverse_df[['Universe', 'Reality', 'Data']].copy() # Create a copy to avoid SettingWithCopyWarning
     
     # Normalize data for consistent scaling
     alignment_df.loc[:, 'Data'] = (alignment_df['Data'] - alignment_df['Data'].min()) / (alignment_df['Data'].max() - alignment_df['Data'].min())
     
-    # Define number of reality clusters (hyperparameter tuning possible)
-    n_clusters = 5
-    
     # Apply K-Means clustering for reality alignment
     # Set n_jobs=-1 to use all available CPU cores for potentially faster clustering
     # Removed n_jobs=-1 for compatibility with older scikit-learn versions
@@ -20,32 +156,152 @@ def align_realities(multiverse_df):
     if len(alignment_df[['Data']]) < n_clusters:
         warnings.warn(f"Number of samples ({len(alignment_df[['Data']])}) is less than n_clusters ({n_clusters}). Setting n_clusters to number of samples.")
         n_clusters = len(alignment_df[['Data']])
-    kmeans = KMeans(n_clusters=n_clusters, n_init='auto')
-    cluster_labels = kmeans.fit_predict(alignment_df[['Data']])
+    if centroid_cache is not None:
+        cluster_labels = _cached_cluster_labels(multiverse_df['Data'].to_numpy(), alignment_df['Data'].to_numpy(),
+                                                n_clusters, engine, centroid_cache, drift_threshold)
+    elif engine == "ckmeans":
+        cluster_labels, _ = ckmeans_1d(alignment_df['Data'].to_numpy(), n_clusters)
+    elif engine == "histogram":
+        cluster_labels, _ = histogram_kmeans_1d(alignment_df['Data'].to_numpy(), n_clusters)
+    else:
+        kmeans = KMeans(n_clusters=n_clusters, n_init='auto')
+        cluster_labels = kmeans.fit_predict(alignment_df[['Data']])
     
     # Add cluster labels to dataframe
     alignment_df['Reality Cluster'] = cluster_labels
     
     # Align realities within clusters
-    aligned_realities = alignment_df.groupby(['Universe', 'Reality Cluster'])['Data'].mean().reset_index()
+    # observed=True keeps categorical Universe IDs (compact schema) from
+    # expanding into every unobserved Universe/cluster combination
+    aligned_realities = alignment_df.groupby(['Universe', 'Reality Cluster'], observed=True)['Data'].mean().reset_index()
     
     return aligned_realities
-def calculate_reality_similarity(aligned_realities):
+class StreamingRealityAligner:
     """
-    Calculates the pairwise cosine similarity between the average 'Data'
-    values of the aligned reality clusters.
+    Incremental align_realities() for chunked multiverse streams, e.g.
+    multiverse_ingestion.iter_multiverse_data() or iter_multiverse_store().
+
+    Memory is bounded by one chunk plus a running sum and count per
+    (Universe, cluster). Centroids are refined with MiniBatchKMeans.partial_fit
+    and each chunk is labeled with the centroids current at that point, so the
+    result approximates a full KMeans fit. Min/max normalization is affine, so
+    clustering the raw values is equivalent to clustering normalized ones; the
+    running min/max is applied only when the means are reported.
     """
-    # Pivot the data to have clusters as rows/columns if needed for interpretation,
-    # but cosine_similarity works directly on the feature array.
-    # Ensure 'Data' is shaped correctly (N_samples, N_features=1)
-    data_vectors = aligned_realities[['Data']].values
-    
-    # Calculate pairwise cosine similarity matrix
-    similarity_matrix = cosine_similarity(data_vectors)
-    
-    # Convert similarity matrix to dataframe
-    # Use unique identifiers for index/columns if available, e.g., Reality Cluster IDs
-    # Assuming Reality Cluster is unique per row after groupby
-    cluster_ids = aligned_realities['Reality Cluster'].unique() # Or use index if appropriate
-    similarity_df = pd.DataFrame(similarity_matrix, index=cluster_ids, columns=cluster_ids)
-    return similarity_df
+    def __init__(self, n_clusters=5, seed=None, batch_size=16384):
+        """
+        Args:
+            n_clusters (int): Number of reality clusters.
+            seed (int, optional): Seed for the centroid initialization.
+            batch_size (int): Rows per MiniBatchKMeans step; a chunk is split
+                              into several steps so large chunks still move
+                              the centroids more than once.
+        """
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=seed, compute_labels=False)
+        self.data_min = np.inf
+        self.data_max = -np.inf
+        self.sums = None # DataFrame indexed by (Universe, cluster) with sum/count columns
+        self._pending = [] # Chunks held back until there are enough rows to initialize
+
+    def partial_fit(self, chunk):
+        """
+        Adds a chunk: updates the min/max, the centroids and the per-(Universe,
+        cluster) sums.
+
+        Args:
+            chunk (pd.DataFrame): Rows with 'Universe' and 'Data' columns.
+
+        Returns:
+            StreamingRealityAligner: self.
+        """
+        if not hasattr(self.kmeans, "cluster_centers_"):
+            # The first partial_fit needs at least n_clusters rows
+            self._pending.append(chunk[['Universe', 'Data']])
+            if sum(len(c) for c in self._pending) < self.n_clusters:
+                return self
+            chunk = pd.concat(self._pending, ignore_index=True)
+            self._pending = []
+        if len(chunk) == 0:
+            return self
+
+        values = chunk['Data'].to_numpy()
+        self.data_min = min(self.data_min, float(values.min()))
+        self.data_max = max(self.data_max, float(values.max()))
+        features = values.reshape(-1, 1)
+        for start in range(0, len(features), self.batch_size):
+            self.kmeans.partial_fit(features[start:start + self.batch_size])
+        labels = self.kmeans.predict(features)
+
+        grouped = chunk['Data'].astype(np.float64).groupby([chunk['Universe'], labels], observed=True)
+        chunk_sums = pd.DataFrame({'sum': grouped.sum(), 'count': grouped.count()})
+        self.sums = chunk_sums if self.sums is None else self.sums.add(chunk_sums, fill_value=0)
+        return self
+
+    def cluster_centers(self):
+        """Centroids on the normalized [0, 1] scale, in ascending order."""
+        centers = np.sort(self.kmeans.cluster_centers_[:, 0])
+        return (centers - self.data_min) / (self.data_max - self.data_min)
+
+    def aligned_realities(self):
+        """
+        Mean normalized 'Data' per ('Universe', 'Reality Cluster') of all
+        chunks so far, in the format of align_realities(). Clusters are
+        numbered by ascending centroid.
+
+        Raises:
+            ValueError: If fewer than n_clusters rows have been seen.
+        """
+        if self.sums is None:
+            raise ValueError(f"At least {self.n_clusters} rows are needed before clusters can be reported.")
+        rank = np.argsort(np.argsort(self.kmeans.cluster_centers_[:, 0]))
+        means = self.sums['sum'] / self.sums['count']
+        aligned_realities = pd.DataFrame({
+            'Universe': means.index.get_level_values(0),
+            'Reality Cluster': rank[means.index.get_level_values(1)],
+            'Data': (means.to_numpy() - self.data_min) / (self.data_max - self.data_min),
+        })
+        return aligned_realities.sort_values(['Universe', 'Reality Cluster'], ignore_index=True)
+
+def align_realities_streaming(chunks, n_clusters=5, seed=None):
+    """
+    Streaming counterpart of align_realities(): one pass over `chunks` with
+    bounded memory.
+
+    Args:
+        chunks (iterable): DataFrame chunks with 'Universe' and 'Data' columns.
+        n_clusters (int): Number of reality clusters.
+        seed (int, optional): Seed for the centroid initialization.
+
+    Returns:
+        pd.DataFrame: Mean 'Data' per ('Universe', 'Reality Cluster').
+    """
+    aligner = StreamingRealityAligner(n_clusters=n_clusters, seed=seed)
+    for chunk in chunks:
+        aligner.partial_fit(chunk)
+    return aligner.aligned_realities()
+
+def calculate_reality_similarity(aligned_realities, feature_columns=('Data',), block_rows=None):
+    """
+    Calculates the pairwise cosine similarity between the aligned reality
+    clusters without materializing an N x N matrix.
+
+    Args:
+        aligned_realities (pd.DataFrame): Output of align_realities().
+        feature_columns (tuple): Columns forming each cluster's vector.
+        block_rows (int, optional): Rows per block for multi-feature vectors.
+
+    Returns:
+        SignSimilarity for a single feature (every similarity is then
+        sign(a) * sign(b)), otherwise BlockedCosineSimilarity. Both offer
+        top_k(k) and, for small inputs, to_frame() with the dense matrix.
+        Rows are labeled by their ('Universe', 'Reality Cluster') pair.
+    """
+    # Label every row by its (Universe, Reality Cluster) pair; cluster IDs
+    # alone repeat once per Universe and do not identify a row
+    labels = pd.MultiIndex.from_frame(aligned_realities[['Universe', 'Reality Cluster']])
+    feature_columns = list(feature_columns)
+    if len(feature_columns) == 1:
+        return SignSimilarity(aligned_realities[feature_columns[0]].to_numpy(), labels)
+    return BlockedCosineSimilarity(aligned_realities[feature_columns].to_numpy(), labels, block_rows=block_rows)
@@ -0,0 +1,137 @@
+"""
+Streaming top-k selection of the most stable realities.
+
+TopKSelector keeps a bounded heap of the best k rows seen so far, so scored
+results can be fed in chunks of any size and the full result set never has
+to be in memory or sorted. Each chunk is pre-filtered with vectorized
+operations; only its own top-k candidates reach the heap.
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+SCORE_COLUMN = 'Predicted Stability'
+
+# How rows with equal scores are ranked: "first" prefers the row seen first
+# (like DataFrame.nlargest), "last" the row seen last, "label" the smallest
+# index label.
+TIE_BREAKS = ("first", "last", "label")
+
+
+class _Descending:
+    """Wraps a label so that heap comparisons rank smaller labels higher."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class TopKSelector:
+    """Bounded-heap selector of the k highest-scoring rows of a chunked stream."""
+    def __init__(self, k=3, score_column=SCORE_COLUMN, tie_break="first"):
+        """
+        Args:
+            k (int): Number of rows to keep.
+            score_column (str): Column ranked in descending order.
+            tie_break (str): One of TIE_BREAKS.
+
+        Raises:
+            ValueError: If k < 1 or the tie break is unknown.
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}.")
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"Unknown tie break '{tie_break}'. Expected one of {TIE_BREAKS}.")
+        self.k = k
+        self.score_column = score_column
+        self.tie_break = tie_break
+        self.rows_seen = 0
+        # Min-heap of (score, tie key, position, one-row DataFrame); the root
+        # is the worst row kept
+        self._heap = []
+        self._empty = None # Zero-row slice of the input, returned when nothing was selected
+
+    def _tie_key(self, label, position):
+        """Secondary sort key of a row; larger means better."""
+        if self.tie_break == "first":
+            return -position
+        if self.tie_break == "last":
+            return position
+        return _Descending(label)
+
+    def update(self, chunk):
+        """
+        Adds a chunk of scored rows; rows with a NaN score are ignored.
+
+        Args:
+            chunk (pd.DataFrame): Rows indexed by reality label with `score_column`.
+
+        Returns:
+            TopKSelector: self.
+        """
+        if self._empty is None:
+            self._empty = chunk.iloc[:0]
+        scores = chunk[self.score_column].to_numpy(dtype=np.float64)
+        start = self.rows_seen
+        self.rows_seen += len(chunk)
+
+        candidates = np.flatnonzero(~np.isnan(scores))
+        if len(candidates) > self.k:
+            # Only rows scoring at least the chunk's k-th best can enter the heap
+            threshold = np.partition(scores[candidates], len(candidates) - self.k)[len(candidates) - self.k]
+            candidates = candidates[scores[candidates] >= threshold]
+        if len(candidates) > self.k:
+            # Ties at the threshold: rank them within the chunk first
+            if self.tie_break == "label":
+                secondary = chunk.index.to_numpy()[candidates]
+            else:
+                secondary = candidates if self.tie_break == "first" else -candidates
+            candidates = candidates[np.lexsort((secondary, -scores[candidates]))[:self.k]]
+
+        for i in candidates:
+            key = (scores[i], self._tie_key(chunk.index[i], start + i), start + i)
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, key + (chunk.iloc[[i]],))
+            elif key > self._heap[0][:3]:
+                # Positions are unique, so comparisons never reach the row itself
+                heapq.heapreplace(self._heap, key + (chunk.iloc[[i]],))
+        return self
+
+    def result(self):
+        """
+        The selected rows, best first.
+
+        Returns:
+            pd.DataFrame: Up to k rows with the columns of the input chunks.
+        """
+        ranked = sorted(self._heap, key=lambda entry: entry[:3], reverse=True)
+        if not ranked:
+            return self._empty if self._empty is not None else pd.DataFrame(columns=[self.score_column])
+        return pd.concat([row for *_, row in ranked])
+
+
+def select_top_realities(scored, k=3, score_column=SCORE_COLUMN, tie_break="first"):
+    """
+    Selects the k highest-scoring realities from a DataFrame or a stream of them.
+
+    Args:
+        scored (pd.DataFrame or iterable): Scored rows, or chunks of them,
+                                           indexed by reality label.
+        k (int): Number of realities.
+        score_column (str): Column ranked in descending order.
+        tie_break (str): One of TIE_BREAKS.
+
+    Returns:
+        pd.DataFrame: The selected rows, best first.
+    """
+    selector = TopKSelector(k=k, score_column=score_column, tie_break=tie_break)
+    for chunk in ([scored] if isinstance(scored, pd.DataFrame) else scored):
+        selector.update(chunk)
+    return selector.result()
@@ -0,0 +1,143 @@
+"""
+Pairwise cosine similarity of aligned realities without an N x N matrix.
+
+With a single feature every cosine similarity is sign(a) * sign(b), so
+SignSimilarity keeps one int8 sign per reality. With several features,
+BlockedCosineSimilarity answers top-k queries one block of rows at a time,
+so memory is bounded by block_rows x N instead of N x N. Both expose the same
+interface: top_k() for nearest neighbours and to_frame() for the dense matrix
+when N is small enough to want it.
+"""
+import numpy as np
+import pandas as pd
+
+# Target number of similarity scores materialized per block
+BLOCK_ELEMENTS = 1 << 22
+
+
+def _neighbor_frame(labels, sources, neighbors, similarities):
+    """Long-format top-k result: source labels, neighbour labels and similarity."""
+    source_labels = labels.take(sources).to_frame(index=False)
+    neighbor_labels = labels.take(neighbors).to_frame(index=False)
+    neighbor_labels.columns = [f"Neighbor {name}" for name in neighbor_labels.columns]
+    result = pd.concat([source_labels, neighbor_labels], axis=1)
+    result['Similarity'] = similarities
+    return result
+
+
+class SignSimilarity:
+    """Cosine similarity of one-feature vectors, stored as one sign per row."""
+    def __init__(self, values, labels):
+        """
+        Args:
+            values (array-like): The single feature of every row.
+            labels (pd.Index): One unique label per row.
+        """
+        self.signs = np.sign(np.asarray(values, dtype=np.float64)).astype(np.int8)
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.signs)
+
+    def similarity(self, i, j):
+        """Similarity of the rows at positions i and j."""
+        return int(self.signs[i]) * int(self.signs[j])
+
+    def top_k(self, k=10):
+        """
+        The k most similar other rows of every row, in O(N * k).
+
+        Rows of the same sign (similarity 1) come first, then zero rows, then
+        rows of the opposite sign; ties are broken by row position.
+
+        Args:
+            k (int): Neighbours per row (capped at N - 1).
+
+        Returns:
+            pd.DataFrame: One row per (source, neighbour) pair.
+        """
+        n = len(self.signs)
+        k = min(k, n - 1)
+        positions = np.arange(n)
+        sources = np.repeat(positions, k)
+        neighbors = np.empty((n, k), dtype=np.intp)
+        by_sign = {sign: positions[self.signs == sign] for sign in (-1, 0, 1)}
+        for sign in (-1, 0, 1):
+            rows = by_sign[sign]
+            if k == 0 or len(rows) == 0:
+                continue
+            # Every row of a sign class shares one preference order; only the
+            # first k + 1 entries matter once the row itself is skipped
+            preferred = (sign, 0, -sign) if sign else (0, 1, -1)
+            candidates = np.concatenate([by_sign[s] for s in preferred])[:k + 1]
+            is_own = candidates == rows[:, None]
+            own = np.where(is_own.any(axis=1), is_own.argmax(axis=1), k)
+            slots = np.arange(k)
+            neighbors[rows] = candidates[slots + (slots >= own[:, None])]
+        neighbors = neighbors.ravel()
+        similarities = self.signs[sources].astype(np.int64) * self.signs[neighbors]
+        return _neighbor_frame(self.labels, sources, neighbors, similarities.astype(np.float64))
+
+    def to_frame(self):
+        """The dense N x N similarity matrix as a labeled DataFrame."""
+        signs = self.signs.astype(np.float64)
+        return pd.DataFrame(np.outer(signs, signs), index=self.labels, columns=self.labels)
+
+
+class BlockedCosineSimilarity:
+    """Cosine similarity of multi-feature vectors, computed one row block at a time."""
+    def __init__(self, vectors, labels, block_rows=None):
+        """
+        Args:
+            vectors (array-like): (N, features) matrix.
+            labels (pd.Index): One unique label per row.
+            block_rows (int, optional): Rows per block; by default about
+                                        BLOCK_ELEMENTS scores per block.
+        """
+        vectors = np.asarray(vectors, dtype=np.float64)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # Zero vectors get similarity 0 with everything, as in sklearn
+        self.unit_vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        self.labels = labels
+        self.block_rows = block_rows or max(1, BLOCK_ELEMENTS // max(1, len(vectors)))
+
+    def __len__(self):
+        return len(self.unit_vectors)
+
+    def similarity(self, i, j):
+        """Similarity of the rows at positions i and j."""
+        return float(self.unit_vectors[i] @ self.unit_vectors[j])
+
+    def iter_blocks(self):
+        """Yields (start, block) with block = similarities of rows start..start+len(block) to all rows."""
+        for start in range(0, len(self.unit_vectors), self.block_rows):
+            yield start, self.unit_vectors[start:start + self.block_rows] @ self.unit_vectors.T
+
+    def top_k(self, k=10):
+        """
+        The k most similar other rows of every row, without materializing the
+        full matrix.
+
+        Args:
+            k (int): Neighbours per row (capped at N - 1).
+
+        Returns:
+            pd.DataFrame: One row per (source, neighbour) pair, most similar first.
+        """
+        n = len(self.unit_vectors)
+        k = min(k, n - 1)
+        neighbors = np.empty((n, k), dtype=np.intp)
+        similarities = np.empty((n, k))
+        for start, block in (self.iter_blocks() if k > 0 else ()):
+            rows = np.arange(len(block))
+            block[rows, start + rows] = -np.inf # Exclude each row itself
+            best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(block, best, axis=1)
+            order = np.argsort(-scores, axis=1, kind="stable")
+            neighbors[start:start + len(block)] = np.take_along_axis(best, order, axis=1)
+            similarities[start:start + len(block)] = np.take_along_axis(scores, order, axis=1)
+        return _neighbor_frame(self.labels, np.repeat(np.arange(n), k), neighbors.ravel(), similarities.ravel())
+
+    def to_frame(self):
+        """The dense N x N similarity matrix as a labeled DataFrame."""
+        return pd.DataFrame(self.unit_vectors @ self.unit_vectors.T, index=self.labels, columns=self.labels)
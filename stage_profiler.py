@@ -0,0 +1,174 @@
+"""
+Per-stage instrumentation for pipeline runs.
+
+StageProfiler records wall time, CPU time and peak resident memory for each
+named stage, and can optionally capture a cProfile and tracemalloc summary
+per stage. The whole run is written as one JSON report, so runs at different
+dataset sizes can be compared and regressions tracked.
+"""
+import cProfile
+import datetime
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from atomic_write import atomic_write
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+REPORT_VERSION = 1
+TOP_ENTRIES = 15 # Functions / allocation sites listed per stage
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _top_functions(profile):
+    stats = pstats.Stats(profile).stats
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_ENTRIES]
+    return [{
+        "function": f"{filename}:{line}({name})",
+        "calls": calls,
+        "total_seconds": total_time,
+        "cumulative_seconds": cumulative_time,
+    } for (filename, line, name), (_, calls, total_time, cumulative_time, _) in ranked]
+
+
+class StageProfiler:
+    """Collects per-stage timings and memory use for one run."""
+    def __init__(self, cprofile=False, tracemalloc_enabled=False, profile_dir=None):
+        """
+        Args:
+            cprofile (bool): Profile every stage with cProfile and list its
+                             most expensive functions in the report.
+            tracemalloc_enabled (bool): Trace Python allocations per stage
+                                        (slows the run down noticeably).
+            profile_dir (str, optional): Directory for per-stage .prof files
+                                         (viewable with pstats/snakeviz).
+        """
+        self.cprofile = cprofile
+        self.tracemalloc_enabled = tracemalloc_enabled
+        self.profile_dir = profile_dir
+        self.started = datetime.datetime.now(datetime.timezone.utc)
+        self.stages = []
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measures the enclosed block as stage `name`.
+
+        Yields:
+            dict: The stage's record; callers may add fields such as
+                  whether the stage came from a cache.
+        """
+        record = {"name": name}
+        profile = cProfile.Profile() if self.cprofile else None
+        if self.tracemalloc_enabled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+        rss_start = peak_rss_bytes()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            record["peak_rss_bytes"] = peak_rss_bytes()
+            if rss_start is not None:
+                # The peak only rises; growth shows which stage set a new high
+                record["peak_rss_growth_bytes"] = record["peak_rss_bytes"] - rss_start
+            if self.tracemalloc_enabled:
+                current, peak = tracemalloc.get_traced_memory()
+                record["traced_peak_bytes"] = peak - traced_start
+                record["traced_retained_bytes"] = current - traced_start
+                record["top_allocations"] = [
+                    {"site": str(stat.traceback), "bytes": stat.size, "blocks": stat.count}
+                    for stat in tracemalloc.take_snapshot().statistics("lineno")[:TOP_ENTRIES]
+                ]
+            if profile is not None:
+                record["top_functions"] = _top_functions(profile)
+                if self.profile_dir is not None:
+                    os.makedirs(self.profile_dir, exist_ok=True)
+                    record["profile_file"] = os.path.join(self.profile_dir, f"{len(self.stages):02d}-{name}.prof")
+                    profile.dump_stats(record["profile_file"])
+            self.stages.append(record)
+
+    def report(self, params=None):
+        """
+        Builds the run report.
+
+        Args:
+            params (dict, optional): JSON-serializable run parameters to record
+                                     (dataset size, engines, seeds).
+
+        Returns:
+            dict: Run metadata, per-stage records and totals.
+        """
+        return {
+            "version": REPORT_VERSION,
+            "started": self.started.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "argv": sys.argv,
+            "params": params or {},
+            "stages": self.stages,
+            "total_wall_seconds": time.perf_counter() - self._wall_start,
+            "total_cpu_seconds": time.process_time() - self._cpu_start,
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    def report_path(self, path):
+        """
+        Resolves where write_report() puts the report: `path` itself, or a
+        file named after the run's start time if `path` is a directory.
+        """
+        if os.path.isdir(path):
+            return os.path.join(path, f"activation-{self.started.strftime('%Y%m%dT%H%M%S%fZ')}.json")
+        return path
+
+    def write_report(self, path, params=None):
+        """
+        Writes the report as JSON to report_path(path).
+
+        Returns:
+            str: The path written.
+        """
+        path = self.report_path(path)
+        with atomic_write(path, "w") as f:
+            json.dump(self.report(params), f, indent=2, default=str)
+        return path
+
+    def summary(self):
+        """One line per stage: wall, CPU and peak RSS."""
+        lines = [f"{'stage':<16} {'wall s':>8} {'cpu s':>8} {'peak RSS MiB':>13}"]
+        for record in self.stages:
+            rss = record["peak_rss_bytes"]
+            rss_text = "-" if rss is None else f"{rss / 2**20:.1f}"
+            cached = " (cached)" if record.get("cached") else ""
+            lines.append(f"{record['name']:<16} {record['wall_seconds']:>8.3f} {record['cpu_seconds']:>8.3f} "
+                         f"{rss_text:>13}{cached}")
+        return "\n".join(lines)
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from scipy.stats import chi2_contingency
+
+from multiverse_ingestion import ingest_multiverse_data, universe_generators
+from multiverse_quantum_analysis import analyze_multiverse, shard_seed_sequence
+
+
+@pytest.mark.parametrize("seed", [0, 3, 12345])
+def test_shard_streams_differ_from_data_streams(seed):
+    root_entropy = np.random.SeedSequence(seed).entropy
+    for universe, data_rng in enumerate(universe_generators(seed, 5)):
+        shard_rng = np.random.default_rng(shard_seed_sequence(root_entropy, universe))
+        assert not np.array_equal(shard_rng.random(16), data_rng.random(16))
+
+
+@pytest.mark.parametrize("seed", [0, 3, 12345])
+def test_vectorized_states_independent_of_input_with_shared_seed(seed):
+    df = ingest_multiverse_data(seed=seed)
+    states = analyze_multiverse(df, mode="vectorized", seed=seed)['Quantum_State'].to_numpy()
+    inputs = (df['Data'].to_numpy() > 0.5).astype(np.uint8)
+
+    # Both templates end in a Hadamard, so each input measures 1 half the time
+    table = np.array([[np.sum((inputs == data) & (states == state)) for state in (0, 1)] for data in (0, 1)])
+    _, p_value, _, _ = chi2_contingency(table)
+    assert p_value > 1e-3
+    for data in (0, 1):
+        assert abs(table[data, 1] / table[data].sum() - 0.5) < 0.05
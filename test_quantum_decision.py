@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from scipy.stats import chisquare
+
+from quantum_decision import QuantumDecision, aer_available
+
+DISTRIBUTIONS = [
+    [0.5, 0.5],
+    [0.2, 0.5, 0.3],
+    [0.1, 0.2, 0.3, 0.4],
+    list(np.random.default_rng(7).dirichlet(np.ones(11))),
+]
+
+SAMPLING_BACKENDS = [
+    pytest.param("aer", marks=pytest.mark.skipif(not aer_available(), reason="qiskit-aer is not installed")),
+    "analytic",
+]
+
+
+@pytest.mark.parametrize("probabilities", DISTRIBUTIONS)
+def test_statevector_probabilities_match_stored(probabilities):
+    decision = QuantumDecision([f"Outcome {i}" for i in range(len(probabilities))], probabilities,
+                               backend="statevector")
+    np.testing.assert_allclose(decision.probability_vector(), probabilities, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("backend", SAMPLING_BACKENDS)
+@pytest.mark.parametrize("probabilities", DISTRIBUTIONS)
+def test_make_decisions_follow_probabilities(backend, probabilities):
+    n = 20000
+    decision = QuantumDecision(list(range(len(probabilities))), probabilities, backend=backend, seed=1234)
+    indices, labels = decision.make_decisions(n)
+
+    assert len(indices) == n
+    assert indices.min() >= 0 and indices.max() < len(probabilities)
+    counts = np.bincount(indices, minlength=len(probabilities))
+    _, p_value = chisquare(counts, n * np.asarray(probabilities))
+    assert p_value > 1e-3
+
+
+@pytest.mark.parametrize("backend", SAMPLING_BACKENDS)
+def test_seeded_decisions_are_reproducible(backend):
+    first, _ = QuantumDecision(["a", "b", "c"], [0.2, 0.5, 0.3], backend=backend, seed=99).make_decisions(500)
+    second, _ = QuantumDecision(["a", "b", "c"], [0.2, 0.5, 0.3], backend=backend, seed=99).make_decisions(500)
+    np.testing.assert_array_equal(first, second)